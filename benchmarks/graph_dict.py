@@ -0,0 +1,31 @@
+"""Benchmark showing Family.to_graph_dict scales linearly with family size.
+
+Run from the repository root with: python -m benchmarks.graph_dict
+"""
+import time
+
+from family_tree import Family
+from family_tree.generate import generate_people
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def main() -> None:
+    print(f"{'members':>10} {'load (s)':>10} {'graph (s)':>10} {'us/member':>10}")
+    for size in SIZES:
+        people = generate_people(size, generations=10)
+
+        start = time.perf_counter()
+        family = Family()
+        family.add_people(people)
+        loaded = time.perf_counter()
+        family.to_graph_dict()
+        end = time.perf_counter()
+
+        load_time, graph_time = loaded - start, end - loaded
+        per_member = graph_time / size * 1e6
+        print(f"{size:>10} {load_time:>10.3f} {graph_time:>10.3f} {per_member:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark of memory used per family member, measured with tracemalloc.
+
+Run from the repository root with: python -m benchmarks.memory
+"""
+import tracemalloc
+from datetime import date
+
+from family_tree import Family, Person
+
+SIZE = 10 ** 5
+
+
+def build_family(size: int) -> Family:
+    """Builds a family of couples where every child has two earlier parents."""
+    family = Family()
+    for index in range(0, size, 2):
+        left, right = f"P{index}", f"P{index + 1}"
+        parents = [f"P{index - 4}", f"P{index - 3}"] if index >= 4 else []
+        born = date(1800 + index % 200, 1 + index % 12, 1 + index % 28)
+        family.add_person(
+            Person(left, f"Person {left}", born, None, parents, [right], "London")
+        )
+        family.add_person(Person(right, f"Person {right}", born, None, [], [left]))
+    return family
+
+
+def main() -> None:
+    tracemalloc.start()
+    family = build_family(SIZE)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"members: {len(family)}, couples: {len(family.couples)}")
+    print(f"retained: {current / 2 ** 20:.1f} MiB ({current / SIZE:.0f} B/member)")
+    print(f"peak:     {peak / 2 ** 20:.1f} MiB ({peak / SIZE:.0f} B/member)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark of saving and reopening a Family as a binary snapshot.
+
+Run from the repository root with: python -m benchmarks.snapshot
+"""
+import os
+import tempfile
+import time
+
+from family_tree import Family
+from family_tree.generate import generate_people
+
+SIZES = [10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def main() -> None:
+    print(
+        f"{'members':>10} {'save (s)':>10} {'MiB':>8} {'open (ms)':>10} {'get (us)':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            family = Family()
+            family.add_people(generate_people(size, generations=10))
+            path = os.path.join(directory, f"family_{size}.snapshot")
+
+            start = time.perf_counter()
+            family.save_snapshot(path)
+            saved = time.perf_counter()
+            loaded = Family.load_snapshot(path)
+            opened = time.perf_counter()
+            loaded[f"I{size // 2}"]
+            fetched = time.perf_counter()
+
+            print(
+                f"{size:>10} {saved - start:>10.3f} "
+                f"{os.path.getsize(path) / 2 ** 20:>8.1f} "
+                f"{(opened - saved) * 1e3:>10.2f} {(fetched - opened) * 1e6:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
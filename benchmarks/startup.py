@@ -0,0 +1,71 @@
+"""Benchmark of import time and Family.from_json load time.
+
+Run from the repository root with: python -m benchmarks.startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from family_tree import Family
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+REPEATS = 5
+
+
+def import_time(module: str) -> float:
+    """Median wall time of importing a module in a fresh interpreter."""
+    code = f"import time; s = time.perf_counter(); import {module}; "
+    code += "print(time.perf_counter() - s)"
+    times = [
+        float(subprocess.check_output([sys.executable, "-c", code]))
+        for _ in range(REPEATS)
+    ]
+    return statistics.median(times)
+
+
+def write_family(path: str, size: int) -> None:
+    """Writes a json family where everyone has full or partial dates."""
+    start = date(1800, 1, 1)
+    records = []
+    for index in range(size):
+        born = start + timedelta(days=index % 60000)
+        records.append(
+            {
+                "identifier": f"P{index}",
+                "name": f"Person {index}",
+                "dob": born.isoformat() if index % 3 else str(born.year),
+                "dod": (born + timedelta(days=25000)).isoformat(),
+                "parents": [],
+                "spouses": [],
+                "birth_place": None,
+            }
+        )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+def main() -> None:
+    print(f"import family_tree: {import_time('family_tree'):.3f} s")
+    try:
+        print(f"import pandas:      {import_time('pandas'):.3f} s")
+    except subprocess.CalledProcessError:
+        print("import pandas:      not installed")
+
+    print(f"{'members':>10} {'load (s)':>10} {'us/member':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            path = os.path.join(directory, f"family_{size}.json")
+            write_family(path, size)
+            start = time.perf_counter()
+            Family.from_json(path)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
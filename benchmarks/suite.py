@@ -0,0 +1,75 @@
+"""Benchmark suite covering the main Family and FamilyGraph operations.
+
+Each phase is timed on synthetic families of increasing size, so regressions show
+up as numbers. Run from the repository root with:
+
+    python -m benchmarks.suite [--max-size 1000000] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from family_tree import Family, FamilyGraph
+from family_tree.generate import generate_records
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+QUERIES = 1000
+
+
+def run(size: int, directory: str) -> Dict[str, float]:
+    """Times every phase on a family of the given size, in seconds."""
+    path = os.path.join(directory, f"family_{size}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_records(size, generations=8, seed=size), f)
+
+    results: Dict[str, float] = {}
+
+    def timed(phase: str, action: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        action()
+        results[phase] = time.perf_counter() - start
+
+    family = Family.from_json(path)
+    timed("load", lambda: Family.from_json(path))
+    timed("graph_dict", family.to_graph_dict)
+
+    rng = random.Random(size)
+    identifiers: List[str] = list(family.keys())
+    people = [family[identifier] for identifier in rng.sample(identifiers, QUERIES)]
+    pairs = [(rng.choice(identifiers), rng.choice(identifiers)) for _ in range(QUERIES)]
+    timed("ancestors", lambda: [family.list_ancestors(person) for person in people])
+    timed("relationship", lambda: [family.relationship(*pair) for pair in pairs])
+
+    def write_dot() -> None:
+        with open(os.devnull, "w", encoding="utf-8") as out:
+            FamilyGraph(family, "dot", link=False).write_source(out)
+
+    timed("dot", write_dot)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-size", type=int, default=SIZES[-1])
+    parser.add_argument("--json", help="Also write the results to this json file.")
+    args = parser.parse_args()
+
+    all_results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in [size for size in SIZES if size <= args.max_size]:
+            results = all_results[size] = run(size, directory)
+            if len(all_results) == 1:
+                print(f"{'members':>10}" + "".join(f"{p:>14}" for p in results))
+            print(f"{size:>10}" + "".join(f"{t:>14.4f}" for t in results.values()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(all_results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
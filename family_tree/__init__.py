@@ -1,8 +1,33 @@
 # flake8: noqa
 # pyright: reportMissingImports=false
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from . import constants
+from .dates import PartialDate
+from .instrument import Profiler
 from .person import Person
 from .couple import Couple
 from .family import Family
+from .validate import ValidationError
 
 from .view_family import FamilyGraph
+
+# Imported on first use, as sqlite3, hashlib and thread pools are slow to import
+_LAZY = {
+    "RenderCache": "render",
+    "RenderWorker": "render",
+    "SQLiteFamily": "store",
+}
+
+if TYPE_CHECKING:
+    from .render import RenderCache, RenderWorker
+    from .store import SQLiteFamily
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    globals()[name] = value
+    return value
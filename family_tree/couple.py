@@ -1,5 +1,5 @@
 """This module contains the couple class for linking two spouses together."""
-from typing import Union
+from typing import Tuple, Union
 
 from family_tree import Person
 
@@ -13,9 +13,12 @@ class Couple:
         right: The righthand person in the couple.
 
     Note:
-        The lefthand/righthand ordering is arbitrary and gender neutral.
+        The lefthand/righthand ordering is arbitrary and gender neutral. The key
+        puts the identifiers in a fixed order, so it is the same either way round.
     """
 
+    __slots__ = ("left", "right")
+
     def __init__(self, left: Person, right: Person) -> None:
         """Creates a couple instance.
 
@@ -29,14 +32,10 @@ class Couple:
     def __eq__(self, o: object) -> bool:
         if not isinstance(o, Couple):
             return False
-        return ((self.left == o.left) & (self.right == o.right)) | (
-            (self.left == o.right) & (self.right == o.left)
-        )
+        return self.key == o.key
 
     def __repr__(self) -> str:
-        output = [self.left.identifier, self.right.identifier]
-        output.sort()
-        return " ".join(output)
+        return " ".join(self.key)
 
     def __contains__(self, other: object) -> bool:
         if not isinstance(other, Person):
@@ -44,7 +43,13 @@ class Couple:
         return (other == self.left) | (other == self.right)
 
     def __hash__(self) -> int:
-        return hash(self.left) + hash(self.right)
+        return hash(self.key)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """The two identifiers in sorted order. Used to key Family.couples."""
+        left, right = self.left.identifier, self.right.identifier
+        return (left, right) if left <= right else (right, left)
 
     def return_other(self, target: Person) -> Union[Person, None]:
         """Given a Person in the couple, returns the other Person.
@@ -0,0 +1,122 @@
+"""This module contains the lightweight date handling used by Person."""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from typing import NamedTuple, Optional, Union
+
+_CIRCA = re.compile(r"^(?:circa|ca\.?|c\.?|abt\.?|about|~)\s*(?P<date>.+)$", re.I)
+_ISO_PARTS = re.compile(
+    r"^(?P<year>\d{4})(?:-(?P<month>\d{1,2})(?:-(?P<day>\d{1,2}))?)?$"
+)
+
+
+class PartialDate(NamedTuple):
+    """Represents a date that is only partly known or is approximate.
+
+    Attributes:
+        year: Year of the date.
+        month: Month of the date, if known.
+        day: Day of the month, if known.
+        circa: Whether the date is approximate.
+    """
+
+    year: int
+    month: Optional[int] = None
+    day: Optional[int] = None
+    circa: bool = False
+
+    def __str__(self) -> str:
+        text = f"{self.year:04d}"
+        if self.month is not None:
+            text += f"-{self.month:02d}"
+            if self.day is not None:
+                text += f"-{self.day:02d}"
+        return f"c. {text}" if self.circa else text
+
+
+DateLike = Union[date, PartialDate]
+
+
+def parse_date(value: object) -> Optional[DateLike]:
+    """Converts a value into a date, keeping only as much detail as is known.
+
+    Full ISO dates become datetime.date objects. Year-only, year-month and
+    approximate dates, such as "1890", "1890-05" or "c. 1890", become PartialDate
+    objects. Dates and datetimes are returned unchanged.
+
+    Anything else is passed to pandas.to_datetime if pandas is installed.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        The parsed date, or None if the value is None or empty.
+
+    Raises:
+        ValueError: If the value cannot be understood as a date.
+    """
+    if value is None or isinstance(value, (date, PartialDate)):
+        return value
+
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+
+        circa = False
+        if match := _CIRCA.match(text):
+            text, circa = match.group("date"), True
+
+        if match := _ISO_PARTS.match(text):
+            year, month, day = (
+                int(part) if part else None
+                for part in match.group("year", "month", "day")
+            )
+            if month is not None and day is not None:
+                # Checks the day exists
+                exact = date(year, month, day)  # type: ignore
+                if not circa:
+                    return exact
+            elif month is not None and not 1 <= month <= 12:
+                raise ValueError(f"Month out of range in date {value!r}.")
+            return PartialDate(year, month, day, circa)  # type: ignore
+
+        if not circa:
+            try:
+                return datetime.fromisoformat(text)
+            except ValueError:
+                pass
+
+    return _pandas_to_datetime(value)
+
+
+def format_date(value: DateLike) -> str:
+    """Returns the date as a string, ignoring any time of day."""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def date_text(value: Optional[DateLike]) -> Optional[str]:
+    """Stores a date as text that parse_date reads back unchanged."""
+    if isinstance(value, date):
+        return value.isoformat()
+    return None if value is None else str(value)
+
+
+def _pandas_to_datetime(value: object) -> Optional[datetime]:
+    """Falls back to pandas for formats the standard library does not read."""
+    try:
+        import pandas as pd  # type: ignore
+    except ImportError:
+        raise ValueError(
+            f"Could not parse date {value!r}. Install pandas for more formats."
+        ) from None
+
+    timestamp = pd.to_datetime(value)  # type: ignore
+    if pd.isna(timestamp):  # type: ignore
+        return None
+    return timestamp.to_pydatetime()  # type: ignore
@@ -0,0 +1,135 @@
+"""This module contains the parallel export of relationship tables."""
+from __future__ import annotations
+
+import csv
+import io
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Set, Tuple
+
+from family_tree import instrument
+
+if TYPE_CHECKING:
+    from family_tree import Family
+
+HEADER = ["first_id", "second_id", "relationship"]
+# Aim for this many pairs per chunk when no chunk size is given
+_PAIRS_PER_CHUNK = 50000
+
+# Set in each worker process by _start_worker
+_family: Optional[Family] = None
+_identifiers: Sequence[str] = []
+
+
+def export_relationships(
+    family: Family,
+    filepath: str,
+    identifiers: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    delimiter: str = ",",
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """Writes how every person is related to every other person to a file.
+
+    The family is saved to a temporary snapshot that each worker process maps
+    read-only, so it is not copied to every worker. The pairs are split into
+    chunks of first people. Each worker keeps its own ancestor cache across the
+    chunks it is given. Chunks are written as soon as they finish, so rows from
+    different chunks may be in any order, and only a few chunks are held in
+    memory at once.
+
+    Args:
+        family: Family to export.
+        filepath: Location of the file to write.
+        identifiers: People to include, e.g. one of family.components().
+            Defaults to every member.
+        chunk_size: Number of first people in each chunk. Defaults to enough
+            for about 50,000 pairs.
+        max_workers: Maximum number of processes. Defaults to the CPU count.
+        delimiter: Column separator, e.g. "\\t" for a tab separated file.
+        progress: Called with the number of pairs written and the total after
+            each chunk.
+
+    Returns:
+        The number of pairs written.
+    """
+    identifiers = list(family.members if identifiers is None else identifiers)
+    count = len(identifiers)
+    total = count * (count - 1)
+    if chunk_size is None:
+        chunk_size = max(1, _PAIRS_PER_CHUNK // max(count, 1))
+    starts = iter(range(0, count, chunk_size))
+
+    written = 0
+    with instrument.phase("export_relationships", total):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "family.snapshot")
+            family.save_snapshot(snapshot_path)
+
+            executor = ProcessPoolExecutor(
+                max_workers,
+                initializer=_start_worker,
+                initargs=(snapshot_path, identifiers),
+            )
+            with executor, open(filepath, "w", encoding="utf-8", newline="") as out:
+                header = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+                header.writerow(HEADER)
+                # Keeps a couple of chunks queued per worker, no more
+                limit = 2 * (max_workers or os.cpu_count() or 1)
+                pending: Set[Future[Tuple[str, int]]] = set()
+                while True:
+                    for start in starts:
+                        pending.add(
+                            executor.submit(
+                                _relationship_rows, start, chunk_size, delimiter
+                            )
+                        )
+                        if len(pending) >= limit:
+                            break
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rows, rows_written = future.result()
+                        out.write(rows)
+                        written += rows_written
+                        if progress is not None:
+                            progress(written, total)
+
+    return written
+
+
+def _start_worker(snapshot_path: str, identifiers: Sequence[str]) -> None:
+    """Opens the shared snapshot once in each worker process."""
+    from family_tree import Family
+
+    global _family, _identifiers
+    _family = Family.load_snapshot(snapshot_path)
+    _identifiers = identifiers
+
+
+def _relationship_rows(start: int, chunk_size: int, delimiter: str) -> Tuple[str, int]:
+    """Computes one chunk in a worker process.
+
+    Returns:
+        The chunk as csv rows, and the number of rows.
+    """
+    family: Family = _family  # type: ignore
+    rows = io.StringIO()
+    writer = csv.writer(rows, delimiter=delimiter, lineterminator="\n")
+    count = 0
+    end = min(start + chunk_size, len(_identifiers))
+    for position in range(start, end):
+        first_id = _identifiers[position]
+        pairs = [(first_id, second_id) for second_id in _identifiers]
+        del pairs[position]
+        relationships = family.relationships(pairs)
+        writer.writerows(
+            [first, second, relationship]
+            for (first, second), relationship in relationships.items()
+        )
+        count += len(relationships)
+    return rows.getvalue(), count
@@ -2,20 +2,50 @@
 from __future__ import annotations
 
 import json
-from itertools import zip_longest
 from typing import (
+    Any,
+    Container,
     Dict,
+    FrozenSet,
     ItemsView,
+    Iterable,
     Iterator,
     KeysView,
     List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Sequence,
     Set,
     Tuple,
     Union,
     ValuesView,
 )
 
-from family_tree import Couple, Person, constants
+from family_tree import (
+    Couple,
+    Person,
+    constants,
+    graph,
+    instrument,
+    kinship,
+    snapshot,
+    validate,
+)
+
+
+class ComponentSummary(NamedTuple):
+    """Summary of one group of people joined by blood or marriage.
+
+    Attributes:
+        representative: Identifier labelling the component, as in component_of.
+        size: Number of members.
+        generations: Number of generations in the longest recorded line.
+    """
+
+    representative: str
+    size: int
+    generations: int
 
 
 class Family:
@@ -23,7 +53,9 @@ class Family:
 
     Attributes:
         members: Dict of all family members currently added.
-        couples: Dict of all the couples in the family.
+        couples: Dict of all the couples in the family, keyed by Couple.key.
+        parents_of: Dict from each member to the identifiers of their parents.
+        children_of: Dict from each parent to the identifiers of their children.
 
     Note:
         Iterating over the instance actually iterates over the members dict.
@@ -34,8 +66,34 @@ class Family:
         as: family["JJ1990"].
     """
 
-    members: Dict[str, Person] = {}
-    _couples: Dict[str, Couple] = {}
+    members: MutableMapping[str, Person]
+    _couples: MutableMapping[Tuple[str, str], Couple]
+    _couples_of: MutableMapping[str, List[Couple]]
+    _pending_spouses: MutableMapping[str, List[Person]]
+    _parents_of: MutableMapping[str, Tuple[str, ...]]
+    _children_of: MutableMapping[str, List[str]]
+    _component_parent: MutableMapping[str, str]
+    _component_size: MutableMapping[str, int]
+    _ancestor_cache: Dict[str, Tuple[FrozenSet[str], ...]]
+    _generation_cache: Dict[str, Dict[str, int]]
+    _compiled: Optional[graph.CompiledGraph]
+
+    def __init__(self) -> None:
+        """Creates an empty Family."""
+        self.members = {}
+        self._couples = {}
+        self._couples_of = {}
+        # Maps an identifier that has not been added yet to the members who list
+        # it as a spouse, so couples can be formed when it arrives.
+        self._pending_spouses = {}
+        self._parents_of = {}
+        self._children_of = {}
+        # Disjoint-set forest over identifiers, joined by parent and couple links
+        self._component_parent = {}
+        self._component_size = {}
+        self._ancestor_cache = {}
+        self._generation_cache = {}
+        self._compiled = None
 
     def __len__(self) -> int:
         return len(self.members)
@@ -44,7 +102,21 @@ class Family:
         return self.members[key]
 
     def __setitem__(self, key: str, item: Person) -> None:
-        self.members[key] = item
+        """Adds a person, or replaces the member with the same identifier, keeping
+        the indexes up to date.
+
+        Raises:
+            KeyError: If the key is not the person's identifier.
+        """
+        if key != item.identifier:
+            raise KeyError(f"{key} does not match the identifier {item.identifier}.")
+        old_person = self.members.get(key)
+        if old_person is not None:
+            self._detach(old_person)
+        self._insert(item)
+        if old_person is not None:
+            # Components can only be merged, so removing links means starting over
+            self._rebuild_components()
 
     def __iter__(self) -> Iterator[str]:
         return iter(self.members)
@@ -59,9 +131,33 @@ class Family:
         return self.members.values()
 
     @property
-    def couples(self) -> Dict[str, Couple]:
+    def couples(self) -> MutableMapping[Tuple[str, str], Couple]:
         return self._couples
 
+    def couples_of(self, person: Person) -> List[Couple]:
+        """Lists the couples the given person is part of.
+
+        Args:
+            person: Person to list the couples for.
+
+        Returns:
+            List of couples, in the order they were formed.
+        """
+        return list(self._couples_of.get(person.identifier, []))
+
+    @property
+    def parents_of(self) -> MutableMapping[str, Tuple[str, ...]]:
+        """Maps each member's identifier to the identifiers of their parents."""
+        return self._parents_of
+
+    @property
+    def children_of(self) -> MutableMapping[str, List[str]]:
+        """Maps a parent's identifier to the identifiers of their children.
+
+        Parents that have not been added to the family yet are included.
+        """
+        return self._children_of
+
     def add_person(self, new_person: Person) -> None:
         """Adds a new person to the family. Also checks if they are in a couple.
 
@@ -69,15 +165,342 @@ class Family:
             new_person (Person): Person to be added to the family.
         """
         if new_person.identifier not in self.members.keys():
-            self._update_couples(new_person)
-            self.members[new_person.identifier] = new_person
+            self._insert(new_person)
+
+    def add_people(self, new_people: Iterable[Person]) -> None:
+        """Adds several people to the family in a single pass.
+
+        Equivalent to calling add_person on each person in turn.
+
+        Args:
+            new_people (Iterable[Person]): People to be added to the family.
+        """
+        members = self.members
+        for new_person in new_people:
+            if new_person.identifier not in members:
+                self._insert(new_person)
+
+    def _insert(self, new_person: Person) -> None:
+        """Helper function for adding a person not yet in the family."""
+        self._component_size[self._find(new_person.identifier)] += 1
+        self._update_couples(new_person)
+        self._update_lineage(new_person)
+        self.members[new_person.identifier] = new_person
+        self._invalidate_ancestors(new_person.identifier)
+        self._compiled = None
+
+    def _detach(self, old_person: Person) -> None:
+        """Helper function for replacing a member.
+
+        Removes them from the parent and couple indexes, but leaves their place
+        in members so the replacement keeps it.
+        """
+        identifier = old_person.identifier
+        for parent in self._parents_of.pop(identifier, ()):
+            children = self._children_of[parent]
+            children.remove(identifier)
+            if not children:
+                del self._children_of[parent]
+
+        for couple in self._couples_of.pop(identifier, []):
+            del self._couples[couple.key]
+            other = couple.right if couple.left == old_person else couple.left
+            others = self._couples_of[other.identifier]
+            others.remove(couple)
+            if not others:
+                del self._couples_of[other.identifier]
+            # They can pair up again with whoever replaces the old person
+            if identifier in other.spouses:
+                self._pending_spouses.setdefault(identifier, []).append(other)
+
+        for spouse in old_person.spouses:
+            waiting = self._pending_spouses.get(spouse, [])
+            if old_person in waiting:
+                waiting.remove(old_person)
+                if not waiting:
+                    del self._pending_spouses[spouse]
 
     def _update_couples(self, new_person: Person) -> None:
-        """Helper function for updating the couples dict."""
-        for person in self.members.values():
-            if new_person.identifier in person.spouses:
-                new_couple = Couple(person, new_person)
-                self._couples[str(new_couple)] = new_couple
+        """Helper function for updating the couples dict.
+
+        Forms a couple with every existing member listing the new person as a
+        spouse, then records the new person's own spouses that are yet to arrive.
+        """
+        for person in self._pending_spouses.pop(new_person.identifier, []):
+            new_couple = Couple(person, new_person)
+            if new_couple.key in self._couples:
+                continue
+            self._couples[new_couple.key] = new_couple
+            for partner in (person, new_person):
+                self._couples_of.setdefault(partner.identifier, []).append(new_couple)
+            self._union(person.identifier, new_person.identifier)
+
+        for spouse in new_person.spouses:
+            if spouse not in self.members and spouse != new_person.identifier:
+                self._pending_spouses.setdefault(spouse, []).append(new_person)
+
+    def _update_lineage(self, new_person: Person) -> None:
+        """Helper function for updating the parent and child indexes."""
+        identifier = new_person.identifier
+        self._parents_of[identifier] = new_person.parents
+        for parent in new_person.parents:
+            self._children_of.setdefault(parent, []).append(identifier)
+            self._union(identifier, parent)
+
+    def set_parents(self, person: Person, parents: List[str]) -> None:
+        """Replaces the parents of a person already in the family.
+
+        Use this rather than assigning to person.parents directly so the lineage
+        indexes and cached ancestors stay up to date.
+
+        Args:
+            person: Person whose parents are changing.
+            parents: Identifiers of the new parents.
+        """
+        identifier = person.identifier
+        old_parents = self._parents_of.get(identifier, ())
+        for parent in old_parents:
+            self._children_of[parent].remove(identifier)
+            if not self._children_of[parent]:
+                del self._children_of[parent]
+
+        person.parents = tuple(parents)
+        self._update_lineage(person)
+        self._invalidate_ancestors(identifier)
+        self._compiled = None
+        if not set(old_parents).issubset(person.parents):
+            # Components can only be merged, so removing a link means starting over
+            self._rebuild_components()
+
+    def parents(self, person: Person) -> List[Person]:
+        """Lists the parents of the given person that are in the family.
+
+        Args:
+            person: Person to list the parents for.
+
+        Returns:
+            List of the person's parents.
+        """
+        return [
+            self.members[parent]
+            for parent in self._parents_of.get(person.identifier, ())
+            if parent in self.members
+        ]
+
+    def children(self, person: Person) -> List[Person]:
+        """Lists the children of the given person that are in the family.
+
+        Args:
+            person: Person to list the children for.
+
+        Returns:
+            List of the person's children.
+        """
+        return [
+            self.members[child]
+            for child in self._children_of.get(person.identifier, [])
+        ]
+
+    def components(self) -> List[List[str]]:
+        """Splits the family into groups joined by blood or marriage.
+
+        Siblings whose parent has not been added are still grouped together.
+
+        Returns:
+            List of components, each a list of identifiers in the order they
+            were added to the family.
+        """
+        grouped: Dict[str, List[str]] = {}
+        for identifier in self.members:
+            grouped.setdefault(self._find(identifier), []).append(identifier)
+        return list(grouped.values())
+
+    def component_of(self, identifier: str) -> str:
+        """Returns a label for the component the given member belongs to.
+
+        The label is the identifier of one of the component's members, and is the
+        same for everyone in the component until it merges with another.
+
+        Args:
+            identifier: Unique identifier of a member.
+
+        Returns:
+            Identifier representing the component.
+        """
+        if identifier not in self.members:
+            raise KeyError(identifier)
+        return self._find(identifier)
+
+    def component_size(self, identifier: str) -> int:
+        """Returns the number of members in the given member's component."""
+        return self._component_size[self.component_of(identifier)]
+
+    def component_summaries(self) -> List[ComponentSummary]:
+        """Summarises the size and depth of every component.
+
+        Returns:
+            List of summaries, largest component first.
+        """
+        depths = self._generation_depths()
+        generations: Dict[str, int] = {}
+        for identifier in self.members:
+            root = self._find(identifier)
+            generations[root] = max(generations.get(root, 0), depths[identifier] + 1)
+
+        summaries = [
+            ComponentSummary(root, self._component_size[root], count)
+            for root, count in generations.items()
+        ]
+        summaries.sort(key=lambda summary: summary.size, reverse=True)
+        return summaries
+
+    def _find(self, identifier: str) -> str:
+        """Finds the root of identifier's component in the disjoint-set forest.
+
+        Identifiers not seen before, such as parents who have not been added,
+        start a component of their own with no members.
+        """
+        parents = self._component_parent
+        if identifier not in parents:
+            parents[identifier] = identifier
+            self._component_size[identifier] = 0
+            return identifier
+
+        while (parent := parents[identifier]) != identifier:
+            # Path halving keeps later lookups close to constant time
+            grandparent = parents[parent]
+            parents[identifier] = grandparent
+            identifier = grandparent
+        return identifier
+
+    def _union(self, first: str, second: str) -> None:
+        """Merges the components of the two identifiers, smaller into larger."""
+        first, second = self._find(first), self._find(second)
+        if first == second:
+            return
+        sizes = self._component_size
+        if sizes[first] < sizes[second]:
+            first, second = second, first
+        self._component_parent[second] = first
+        sizes[first] += sizes.pop(second)
+
+    def _rebuild_components(self) -> None:
+        """Recreates the disjoint-set forest from the members and couples."""
+        self._component_parent = {}
+        self._component_size = {}
+        for identifier, person in self.members.items():
+            self._component_size[self._find(identifier)] += 1
+            for parent in person.parents:
+                self._union(identifier, parent)
+        for couple in self.couples.values():
+            self._union(couple.left.identifier, couple.right.identifier)
+
+    def _generation_depths(self) -> Dict[str, int]:
+        """Returns how many generations of ancestors each member has recorded.
+
+        Matches the number of generations returned by list_ancestors, without
+        building the ancestor sets.
+
+        Raises:
+            ValueError: If a person turns out to be their own ancestor.
+        """
+        depths: Dict[str, int] = {}
+        for identifier in self.members:
+            stack = [(identifier, False)]
+            in_progress: Set[str] = set()
+            while stack:
+                current, expanded = stack.pop()
+                parents = self._parents_of.get(current, ())
+                if expanded:
+                    in_progress.discard(current)
+                    depths[current] = 1 + max(
+                        (depths[parent] for parent in parents), default=-1
+                    )
+                    continue
+                if current in depths:
+                    continue
+
+                in_progress.add(current)
+                stack.append((current, True))
+                for parent in parents:
+                    if parent in in_progress:
+                        raise ValueError(f"{parent} is listed as their own ancestor.")
+                    if parent not in depths:
+                        stack.append((parent, False))
+
+        return depths
+
+    def compile(self) -> graph.CompiledGraph:
+        """Returns an integer indexed copy of the family's links for fast traversal.
+
+        The copy is kept until the family next changes. Requires numpy.
+        """
+        if self._compiled is None:
+            self._compiled = graph.CompiledGraph(self)
+        return self._compiled
+
+    def subfamily(self, identifiers: Iterable[str]) -> Family:
+        """Creates a new Family from some of this family's members.
+
+        Args:
+            identifiers: Identifiers of the members to include.
+
+        Returns:
+            Family: An instance of Family sharing the same Person objects.
+        """
+        family = type(self)()
+        family.add_people(self.members[identifier] for identifier in identifiers)
+        return family
+
+    def neighbourhood(
+        self,
+        identifier: str,
+        ancestors: int = 1,
+        descendants: int = 1,
+        spouses: int = 1,
+    ) -> Family:
+        """Creates a new Family from the members around one person.
+
+        Only the lineage indexes around the person are visited, so the cost
+        depends on the size of the neighbourhood rather than of the family.
+
+        Args:
+            identifier: Unique identifier of the person at the centre.
+            ancestors: Number of generations of ancestors to include.
+            descendants: Number of generations of descendants to include.
+            spouses: Number of marriages to follow out from everyone included.
+
+        Returns:
+            Family: An instance of Family sharing the same Person objects.
+        """
+        members = self.members
+        window = {identifier: None}
+
+        generation = {identifier}
+        for _ in range(ancestors):
+            generation = {
+                parent
+                for child in generation
+                for parent in self._parents_of.get(child, ())
+                if parent in members
+            }
+            window.update(dict.fromkeys(generation))
+
+        for generation in self.list_descendants(members[identifier], descendants):
+            window.update(dict.fromkeys(generation))
+
+        frontier = list(window)
+        for _ in range(spouses):
+            frontier = [
+                spouse
+                for person in frontier
+                for couple in self._couples_of.get(person, [])
+                for spouse in couple.key
+                if spouse not in window
+            ]
+            window.update(dict.fromkeys(frontier))
+
+        return self.subfamily(window)
 
     def to_graph_dict(self) -> Dict[Person, List[Tuple[Person, str]]]:
         """Returns a dictionary of direct family connections."""
@@ -87,38 +510,139 @@ class Family:
 
     def _add_to_graph_dict(self, focus: Person) -> List[Tuple[Person, str]]:
         """Helper function for to_graph_dict."""
-        links = []
-        for couple in self.couples.values():
-            spouse = couple.return_other(focus)
-            if spouse:
-                links.append((spouse, "spouse"))
-
-        for person in self.members.values():
-            if person.name in focus.parents:
-                links.append((person, "parent"))
-
+        links = [
+            (couple.right if couple.left == focus else couple.left, "spouse")
+            for couple in self._couples_of.get(focus.identifier, [])
+        ]
+        links.extend((parent, "parent") for parent in self.parents(focus))
         return links
 
     @classmethod
-    def from_json(cls, filepath: str) -> Family:
+    def from_json(cls, filepath: str, strict: bool = False) -> Family:
         """Creates a Family from a json file.
 
+        Every record is checked before anyone is added, and all the problems
+        found are reported together.
+
         Args:
             filepath (str): Location of the json.
+            strict (bool): Whether every parent and spouse must be in the file,
+                with spouses listing each other.
+
+        Returns:
+            Family: An instance of Family.
+
+        Raises:
+            KeyError: If a record has the wrong keys or identifiers are repeated.
+            validate.ValidationError: If the records do not link up correctly.
+        """
+        family = cls()
+        with instrument.phase("from_json"):
+            with instrument.phase("read"):
+                with open(filepath, encoding="utf-8") as f:
+                    family_json = json.load(f)
+
+            with instrument.phase("validate", len(family_json)):
+                _validate_json(family_json, strict)
+
+            with instrument.phase("build", len(family_json)):
+                family.add_people(Person(**person_json) for person_json in family_json)
+
+        return family
+
+    @classmethod
+    def from_jsonl(cls, filepath: str) -> Family:
+        """Creates a Family from a JSON Lines file, with one person per line.
+
+        Each person is validated and added as their line is read, so the whole
+        file is never held in memory. Parents and spouses that appear later in
+        the file are linked up when they are added. Once everyone is added, the
+        parent counts and cycles are checked as in from_json.
+
+        Args:
+            filepath (str): Location of the JSON Lines file.
+
+        Returns:
+            Family: An instance of Family.
+
+        Raises:
+            KeyError: If a record has the wrong keys or identifiers are repeated.
+            validate.ValidationError: If the parent links are invalid.
+        """
+        family = cls()
+        with instrument.phase("from_jsonl") as record:
+            with open(filepath, encoding="utf-8") as f:
+                family.add_people(_read_jsonl(f, family.members))
+            if record:
+                record.count = len(family)
+            validate.check_lineage(family.parents_of)
+
+        return family
+
+    @classmethod
+    def from_gedcom(cls, filepath: str) -> Family:
+        """Creates a Family from a GEDCOM file.
+
+        Each person is added as their INDI record is read, so the whole file is
+        never held in memory. See gedcom.read_gedcom for how records are mapped.
+        Once everyone is added, the parent links are checked for cycles as in
+        from_json.
+
+        Args:
+            filepath (str): Location of the GEDCOM file.
 
         Returns:
             Family: An instance of Family.
+
+        Raises:
+            validate.ValidationError: If the parent links are invalid.
         """
         family = cls()
-        with open(filepath, encoding="utf-8") as f:
-            family_json = json.load(f)
+        from family_tree import gedcom
 
-        _validate_json(family_json)
+        with instrument.phase("from_gedcom") as record:
+            family.add_people(gedcom.read_gedcom(filepath))
+            if record:
+                record.count = len(family)
+            validate.check_lineage(family.parents_of)
 
-        for person_json in family_json:
-            person = Person(**person_json)
-            family.add_person(person)
+        return family
 
+    def to_gedcom(self, filepath: str) -> None:
+        """Writes the family to a GEDCOM file, one record at a time.
+
+        Args:
+            filepath (str): Location of the GEDCOM file.
+        """
+        from family_tree import gedcom
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            gedcom.write_gedcom(self, f)
+
+    def save_snapshot(self, filepath: str) -> None:
+        """Saves the family to a compact binary snapshot.
+
+        Args:
+            filepath (str): Location of the snapshot file.
+        """
+        snapshot.save_snapshot(self, filepath)
+
+    @classmethod
+    def load_snapshot(cls, filepath: str) -> Family:
+        """Creates a Family from a binary snapshot.
+
+        The file is memory-mapped rather than read, so loading takes the same
+        time for any size of family. People are only created when first looked
+        up.
+
+        Args:
+            filepath (str): Location of the snapshot file.
+
+        Returns:
+            Family: An instance of Family.
+        """
+        family = cls()
+        snapshot.load_snapshot(family, filepath)
         return family
 
     def relationship(self, first_id: str, second_id: str) -> str:
@@ -133,26 +657,183 @@ class Family:
         Returns:
             How second_id is related to first_id.
         """
-        first_person = self.members[first_id]
-        second_person = self.members[second_id]
+        return self._relationship(
+            first_id,
+            self._generations(first_id),
+            second_id,
+            self._generations(second_id),
+        )
+
+    def relationships(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], str]:
+        """Computes the relationship for each pair of identifiers.
+
+        Ancestors are looked up once per person, however many pairs they are in.
+
+        Args:
+            pairs: Iterable of (first_id, second_id) tuples.
+
+        Returns:
+            Dict from each pair to how second_id is related to first_id.
+        """
+        return {
+            (first_id, second_id): self._relationship(
+                first_id,
+                self._generations(first_id),
+                second_id,
+                self._generations(second_id),
+            )
+            for first_id, second_id in pairs
+        }
 
-        first_ancestors = self.list_ancestors(first_person)
-        second_ancestors = self.list_ancestors(second_person)
+    def relationships_from(self, identifier: str) -> Dict[str, str]:
+        """Computes how every other member is related to the given person.
+
+        Args:
+            identifier: Unique identifier of the focus person.
+
+        Returns:
+            Dict from each other member's identifier to their relationship.
+        """
+        focus = self._generations(identifier)
+        return {
+            other: self._relationship(
+                identifier, focus, other, self._generations(other)
+            )
+            for other in self.members
+            if other != identifier
+        }
+
+    def export_relationships(
+        self,
+        filepath: str,
+        identifiers: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> int:
+        """Writes how every person is related to every other person to a csv file.
+
+        The pairs are computed in parallel worker processes. See
+        export.export_relationships for the other options.
+
+        Args:
+            filepath: Location of the file to write.
+            identifiers: People to include. Defaults to every member.
+            **kwargs: Passed on to export.export_relationships.
+
+        Returns:
+            The number of pairs written.
+        """
+        # Imported here, as process pools are slow to import
+        from family_tree import export
 
-        if result := self._parental_check(first_ancestors, second_id, "Parent"):
+        return export.export_relationships(self, filepath, identifiers, **kwargs)
+
+    def _relationship(
+        self,
+        first_id: str,
+        first_generations: Dict[str, int],
+        second_id: str,
+        second_generations: Dict[str, int],
+    ) -> str:
+        """Helper function for the relationship methods."""
+        if result := self._parental_check(first_generations, second_id, "Parent"):
             return result
 
-        if result := self._parental_check(second_ancestors, first_id, "Child"):
+        if result := self._parental_check(second_generations, first_id, "Child"):
             return result
 
-        for index_f, gen_f in enumerate(first_ancestors):
-            for index_s, gen_s in enumerate(second_ancestors):
-                common = gen_f.intersection(gen_s)
-                if common:
-                    return constants.RELATION_MATRIX[index_f][index_s]
+        if common := self._lowest_generations(first_generations, second_generations):
+            return relation_name(*common)
 
         return "Not related by blood"
 
+    def lowest_common_ancestors(self, first_id: str, second_id: str) -> Set[str]:
+        """Finds the common ancestors that determine how two people are related.
+
+        Args:
+            first_id
+            second_id
+
+        Returns:
+            Set of identifiers, empty if the two are not related by blood.
+        """
+        first_generations = self._generations(first_id)
+        second_generations = self._generations(second_id)
+        common = self._lowest_generations(first_generations, second_generations)
+        return {
+            ancestor
+            for ancestor, gen_f in first_generations.items()
+            if (gen_f, second_generations.get(ancestor)) == common
+        }
+
+    @staticmethod
+    def _lowest_generations(
+        first_generations: Dict[str, int], second_generations: Dict[str, int]
+    ) -> Union[Tuple[int, int], None]:
+        """Returns the generation pair of the closest common ancestors, if any.
+
+        The closest generation on the first side wins, then on the second side.
+        Only the smaller of the two maps is scanned.
+        """
+        if len(first_generations) <= len(second_generations):
+            common = [
+                (gen_f, second_generations[ancestor])
+                for ancestor, gen_f in first_generations.items()
+                if ancestor in second_generations
+            ]
+        else:
+            common = [
+                (first_generations[ancestor], gen_s)
+                for ancestor, gen_s in second_generations.items()
+                if ancestor in first_generations
+            ]
+        return min(common) if common else None
+
+    def kinship(self, first_id: str, second_id: str) -> float:
+        """Computes the coefficient of kinship between two people.
+
+        This is the chance that a gene picked at random from each of them is
+        inherited from the same ancestor, e.g. 0.25 for a parent and child or full
+        siblings. Unlike relationship, every shared line of descent counts, so
+        pedigree collapse raises the coefficient. Requires numpy.
+
+        Args:
+            first_id: Unique identifier of the first person.
+            second_id: Unique identifier of the second person.
+
+        Returns:
+            The coefficient of kinship.
+        """
+        return float(kinship.kinship_matrix(self, [first_id, second_id])[0, 1])
+
+    def kinship_matrix(self, identifiers: Sequence[str]) -> Any:
+        """Computes the coefficient of kinship between every pair of people.
+
+        Each person's ancestors are only visited once, however many people are
+        given, and each generation is calculated in one step with numpy.
+
+        Args:
+            identifiers: Unique identifiers of the people.
+
+        Returns:
+            numpy.ndarray: Square matrix of coefficients, in the order given.
+        """
+        return kinship.kinship_matrix(self, identifiers)
+
+    def inbreeding(self, identifier: str) -> float:
+        """Computes a person's coefficient of inbreeding, i.e. the coefficient of
+        kinship between their parents. Requires numpy.
+
+        Args:
+            identifier: Unique identifier of the person.
+
+        Returns:
+            The coefficient of inbreeding.
+        """
+        self_kinship = kinship.kinship_matrix(self, [identifier])[0, 0]
+        return float(2 * self_kinship - 1)
+
     def list_ancestors(self, person: Person) -> List[Set[Union[str]]]:
         """List the ancestors of the given person.
 
@@ -164,69 +845,245 @@ class Family:
         """
         return [set(gen) for gen in self._ancestors(person)]
 
-    def _ancestors(self, person: Person) -> List[List[Union[str]]]:
-        """Recursive function for listing ancestors."""
-        ancestors = []
-        if not person.parents:
-            # Base case
-            return []
-        else:
-            # Add parents to the start of the ancestor list
-            ancestors.append(person.parents)
-            for count, parent in enumerate(person.parents):
-                # If more ancestors exist, continue
-                if result := self._ancestors(self.members[parent]):
-                    # If we are on the second parent, continue
-                    if count == 1:
-                        final_result = []  # Empty list for parents ancestors
-                        # Blends the two ancestor lists together
-                        for side1, side2 in zip_longest(
-                            ancestors[1:], result, fillvalue=[]
-                        ):
-                            final_result.append(side1 + side2)
-                        # Take only the parents
-                        ancestors = [ancestors[0]]
-                        # Extend parents by new ancestor list
-                        ancestors.extend(final_result)
-                    else:
-                        # If on first parent, just extend by their ancestors
-                        ancestors.extend(result)
-
-        return ancestors
+    def list_descendants(
+        self, person: Person, max_generations: Optional[int] = None
+    ) -> Iterator[Set[str]]:
+        """Lazily lists the descendants of the given person.
+
+        Each generation is built from the children index when it is reached, so
+        reading the first few generations of a large line costs only their size.
+
+        Args:
+            person: Person to list the descendants for.
+            max_generations: Stop after this many generations. Defaults to all.
+
+        Yields:
+            Sets where each set is a generation. First set are the children etc.
+
+        Raises:
+            ValueError: If the line goes deeper than there are members, which can
+                only happen when a person is their own ancestor.
+        """
+        children_of = self._children_of
+        generation = {person.identifier}
+        depth = 0
+        while max_generations is None or depth < max_generations:
+            generation = {
+                child for parent in generation for child in children_of.get(parent, ())
+            }
+            if not generation:
+                return
+            depth += 1
+            if depth > len(self.members):
+                raise ValueError(f"{person.identifier} has a cycle among descendants.")
+            yield generation
+
+    def _ancestors(self, person: Person) -> Tuple[FrozenSet[str], ...]:
+        """Returns the cached ancestor generations of a person.
+
+        Members are cached, so repeated lookups are a dictionary access. A person
+        who is not a member is built from their parents' cached generations.
+        """
+        if person.identifier in self.members:
+            self._cache_ancestors(person.identifier)
+            return self._ancestor_cache[person.identifier]
+
+        for parent in person.parents:
+            self._cache_ancestors(parent)
+        return self._merge_generations(person.parents)
+
+    def _generations(self, identifier: str) -> Dict[str, int]:
+        """Returns a cached map from each ancestor to their closest generation."""
+        if (generations := self._generation_cache.get(identifier)) is None:
+            generations = {}
+            for gen_i, people in enumerate(self._ancestors(self.members[identifier])):
+                for ancestor in people:
+                    generations.setdefault(ancestor, gen_i)
+            self._generation_cache[identifier] = generations
+        return generations
+
+    def _cache_ancestors(self, identifier: str) -> None:
+        """Fills the ancestor cache for identifier and everyone above them.
+
+        Walks up the parent index with an explicit stack so deep lines cannot hit
+        the recursion limit. Each person is computed once, after their parents.
+
+        Raises:
+            ValueError: If a person turns out to be their own ancestor.
+        """
+        cache = self._ancestor_cache
+        stack = [(identifier, False)]
+        in_progress: Set[str] = set()
+        while stack:
+            current, expanded = stack.pop()
+            parents = self._parents_of.get(current, ())
+            if expanded:
+                in_progress.discard(current)
+                cache[current] = self._merge_generations(parents)
+                continue
+            if current in cache:
+                continue
+
+            in_progress.add(current)
+            stack.append((current, True))
+            for parent in parents:
+                if parent in in_progress:
+                    raise ValueError(f"{parent} is listed as their own ancestor.")
+                if parent not in cache:
+                    stack.append((parent, False))
+
+    def _merge_generations(self, parents: Sequence[str]) -> Tuple[FrozenSet[str], ...]:
+        """Combines the cached ancestor generations of the given parents."""
+        if not parents:
+            return ()
+
+        lines = [self._ancestor_cache[parent] for parent in parents]
+        if len(lines) == 1:
+            # Single parent lines share their parent's generations outright
+            return (frozenset(parents),) + lines[0]
+
+        generations = [frozenset(parents)]
+        for depth in range(max(len(line) for line in lines)):
+            layer = {line[depth] for line in lines if depth < len(line)}
+            # Reuse the parent's set unless the lines differ at this depth
+            generations.append(
+                layer.pop() if len(layer) == 1 else frozenset().union(*layer)
+            )
+
+        return tuple(generations)
+
+    def _invalidate_ancestors(self, identifier: str) -> None:
+        """Drops the cached ancestors of identifier and all their descendants.
+
+        A person is only cached once their parents are, so the walk can stop at
+        any child that is not cached.
+        """
+        cache = self._ancestor_cache
+        stale = [identifier]
+        while stale:
+            current = stale.pop()
+            cache.pop(current, None)
+            self._generation_cache.pop(current, None)
+            stale.extend(
+                child for child in self._children_of.get(current, []) if child in cache
+            )
 
     def _parental_check(
-        self, ancestors: List[Set[Union[str]]], identifier: str, relation: str
+        self, generations: Dict[str, int], identifier: str, relation: str
     ) -> Union[str, None]:
         """Checks if the identified person is in the list of ancestors.
 
         Args:
-            ancestors: List of sets where each set is a generation of ancestors.
+            generations: Dict from each ancestor to their closest generation.
             identifier: Unique identifier of person being checked.
             relation: Either "Child" or "Parent".
 
         Returns:
             relationship string or None.
         """
-        for gen_i, people in enumerate(ancestors):
-            if identifier in people:
-                if gen_i == 0:
-                    return relation
-                elif gen_i == 1:
-                    return "Grand-" + relation
-                else:
-                    return "Great " * (gen_i - 1) + "Grand-" + relation
-
-        else:
+        gen_i = generations.get(identifier)
+        if gen_i is None:
             return None
+        return lineal_name(gen_i, relation)
+
+
+def lineal_name(gen_i: int, relation: str) -> str:
+    """Names a direct ancestor or descendant from their generation.
+
+    Args:
+        gen_i: Generation of the ancestor, 0 being the parents.
+        relation: Either "Child" or "Parent".
+
+    Returns:
+        relationship string, e.g. "Great Grand-Parent".
+    """
+    if gen_i == 0:
+        return relation
+    elif gen_i == 1:
+        return "Grand-" + relation
+    return "Great " * (gen_i - 1) + "Grand-" + relation
 
 
-def _validate_json(json: List[Dict[str, str]]) -> None:
+def relation_name(index_f: int, index_s: int) -> str:
+    """Names a blood relationship through a common ancestor, to any depth.
+
+    Agrees with constants.RELATION_MATRIX wherever the matrix is defined.
+
+    Args:
+        index_f: Generation of the common ancestor above the first person,
+            where 0 is the first person's parents.
+        index_s: Generation of the common ancestor above the second person.
+
+    Returns:
+        How the second person is related to the first.
+    """
+    if index_f == 0 and index_s == 0:
+        return "Siblings"
+    if index_f == 0 or index_s == 0:
+        relation = "Nephew/Niece" if index_f == 0 else "Aunt/Uncle"
+        generations = max(index_f, index_s)
+        if generations == 1:
+            return relation
+        return "Great " * (generations - 2) + "Grand-" + relation
+
+    name = f"{_ordinal(min(index_f, index_s))} cousin"
+    if removed := abs(index_f - index_s):
+        name += f" {_REMOVALS.get(removed, f'{removed} times')} removed"
+    return name
+
+
+_ORDINALS = [
+    "First",
+    "Second",
+    "Third",
+    "Fourth",
+    "Fifth",
+    "Sixth",
+    "Seventh",
+    "Eighth",
+    "Ninth",
+    "Tenth",
+]
+_REMOVALS = {1: "once", 2: "twice", 3: "thrice"}
+
+
+def _ordinal(number: int) -> str:
+    """Helper function for relation_name."""
+    if number <= len(_ORDINALS):
+        return _ORDINALS[number - 1]
+    if 11 <= number % 100 <= 13:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+    return f"{number}{suffix}"
+
+
+def _validate_json(json: List[Dict[str, Any]], strict: bool = False) -> None:
     """Helper function for from_json."""
-    identifiers = set()
+    identifiers: Set[str] = set()
     for item in json:
-        if item.keys() != constants.EXPECTED_KEYS:
-            raise KeyError("JSON Keys do not match expected keys.")
+        _validate_keys(item)
         identifiers.add(item["identifier"])
 
     if len(identifiers) != len(json):
         raise KeyError("Not all identifier values in the JSON are unique.")
+
+    validate.check_records(json, strict)
+
+
+def _read_jsonl(lines: Iterable[str], identifiers: Container[str]) -> Iterator[Person]:
+    """Helper function for from_jsonl. Validates each record as it is read."""
+    for line in lines:
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        _validate_keys(item)
+        if item["identifier"] in identifiers:
+            raise KeyError("Not all identifier values in the JSON are unique.")
+        yield Person(**item)
+
+
+def _validate_keys(item: Dict[str, str]) -> None:
+    """Helper function for validating a single JSON record."""
+    if item.keys() != constants.EXPECTED_KEYS:
+        raise KeyError("JSON Keys do not match expected keys.")
@@ -0,0 +1,321 @@
+"""This module contains the streaming GEDCOM reader and writer.
+
+Only the parts of GEDCOM that a Person holds are read or written: INDI records
+give people, with their NAME, REFN, BIRT (DATE and PLAC) and DEAT (DATE), and
+FAM records give couples and parents through HUSB, WIFE and CHIL.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+)
+
+from family_tree import Person
+from family_tree.dates import DateLike
+
+if TYPE_CHECKING:
+    from family_tree import Family
+
+MONTHS = [
+    "JAN",
+    "FEB",
+    "MAR",
+    "APR",
+    "MAY",
+    "JUN",
+    "JUL",
+    "AUG",
+    "SEP",
+    "OCT",
+    "NOV",
+    "DEC",
+]
+_PARTNERS = {"HUSB", "WIFE"}
+# Qualifiers that make a date approximate. Ranges keep only their first date.
+_APPROXIMATE = {"ABT", "EST", "CAL", "BEF", "AFT", "BET", "FROM", "TO"}
+_DATE = re.compile(r"^(?:(?P<day>\d{1,2}) )?(?:(?P<month>[A-Z]{3}) )?(?P<year>\d{3,4})")
+
+
+class GedcomLine(NamedTuple):
+    """One line of a GEDCOM file.
+
+    Attributes:
+        level: Nesting level, 0 starting a new record.
+        xref: Cross-reference identifier, e.g. "@I1@", if the line has one.
+        tag: The tag, e.g. "INDI" or "NAME".
+        value: Everything after the tag.
+    """
+
+    level: int
+    xref: Optional[str]
+    tag: str
+    value: str
+
+
+def read_gedcom(filepath: str) -> Iterator[Person]:
+    """Reads the people from a GEDCOM file one record at a time.
+
+    The file is read twice. The first pass keeps only the FAM links and any REFN
+    identifiers, and the second builds each person from their INDI record as it
+    is read, so the file is never held in memory.
+
+    A person's identifier is their REFN if they have one, or their cross-reference
+    identifier without the @ signs.
+
+    Args:
+        filepath: Location of the GEDCOM file.
+
+    Yields:
+        People in the order of their INDI records.
+    """
+    identifiers, parents_of, spouses_of = _read_links(filepath)
+
+    def identifier(xref: str) -> str:
+        return identifiers.get(xref, xref.strip("@"))
+
+    for xref, lines in _records(filepath, "INDI"):
+        facts = _person_facts(lines)
+        yield Person(
+            identifier(xref),
+            facts["NAME"] or "",
+            facts["BIRT.DATE"],
+            facts["DEAT.DATE"],
+            [identifier(parent) for parent in parents_of.get(xref, [])],
+            [identifier(spouse) for spouse in spouses_of.get(xref, [])],
+            facts["BIRT.PLAC"],
+        )
+
+
+def write_gedcom(family: Family, out: TextIO) -> None:
+    """Writes a family as GEDCOM, one record at a time.
+
+    Couples, and the parents of each child, become FAM records. GEDCOM calls the
+    two partners HUSB and WIFE; the first person in the couple is written as HUSB
+    and the second as WIFE, which says nothing about either's gender. Parents who
+    have not been added to the family get an INDI record with only their
+    identifier as a name, so that their children stay linked as siblings.
+
+    A FAM record does not distinguish partners from parents who only share a
+    child, so both are read back as couples.
+
+    Args:
+        family: Family to write.
+        out: Text stream to write to.
+    """
+    xrefs: Dict[str, str] = {}
+    for identifier in family.members:
+        xrefs[identifier] = f"@I{len(xrefs) + 1}@"
+
+    # Each FAM record is keyed by its sorted partners
+    families: Dict[Tuple[str, ...], List[str]] = {}
+    for couple in family.couples.values():
+        families.setdefault(_family_key(*couple.key), [])
+    for identifier, parents in family.parents_of.items():
+        if parents:
+            families.setdefault(_family_key(*parents), []).append(identifier)
+            for parent in parents:
+                xrefs.setdefault(parent, f"@I{len(xrefs) + 1}@")
+
+    family_xrefs: Dict[Tuple[str, ...], str] = {}
+    spouse_in: Dict[str, List[str]] = {}
+    for key in families:
+        family_xrefs[key] = f"@F{len(family_xrefs) + 1}@"
+        for partner in key:
+            spouse_in.setdefault(partner, []).append(family_xrefs[key])
+
+    out.write("0 HEAD\n1 GEDC\n2 VERS 5.5.1\n2 FORM LINEAGE-LINKED\n1 CHAR UTF-8\n")
+    for identifier, xref in xrefs.items():
+        person = family.members.get(identifier)
+        out.write(f"0 {xref} INDI\n")
+        out.write(f"1 NAME {person.name if person else identifier}\n")
+        out.write(f"1 REFN {identifier}\n")
+        if person is not None:
+            _write_event(out, "BIRT", person.dob, person.birth_place)
+            _write_event(out, "DEAT", person.dod, None)
+            if person.parents:
+                out.write(f"1 FAMC {family_xrefs[_family_key(*person.parents)]}\n")
+        for family_xref in spouse_in.get(identifier, []):
+            out.write(f"1 FAMS {family_xref}\n")
+
+    for key, children in families.items():
+        out.write(f"0 {family_xrefs[key]} FAM\n")
+        for tag, partner in zip(("HUSB", "WIFE"), key):
+            out.write(f"1 {tag} {xrefs[partner]}\n")
+        for child in children:
+            out.write(f"1 CHIL {xrefs[child]}\n")
+    out.write("0 TRLR\n")
+
+
+def parse_line(line: str) -> GedcomLine:
+    """Splits a GEDCOM line into its level, xref, tag and value.
+
+    Raises:
+        ValueError: If the line does not start with a level and a tag.
+    """
+    parts = line.strip().split(" ", 2)
+    if len(parts) < 2 or not parts[0].isdigit():
+        raise ValueError(f"Not a GEDCOM line: {line!r}")
+    level = int(parts[0])
+    if parts[1].startswith("@"):
+        rest = parts[2].split(" ", 1) if len(parts) > 2 else [""]
+        return GedcomLine(level, parts[1], rest[0], rest[1] if len(rest) > 1 else "")
+    return GedcomLine(level, None, parts[1], parts[2] if len(parts) > 2 else "")
+
+
+def parse_gedcom_date(value: str) -> Optional[str]:
+    """Converts a GEDCOM date into the text that Person reads.
+
+    Exact dates become ISO dates and partial dates keep only the parts given.
+    Qualified dates, such as "ABT 1890" or "BET 1890 AND 1895", are marked as
+    approximate. A day that does not exist in its month, e.g. "31 FEB 1990", is
+    dropped, keeping the year and month.
+
+    Args:
+        value: GEDCOM date, e.g. "19 OCT 1993", "OCT 1993" or "ABT 1890".
+
+    Returns:
+        The date as text, or None if it cannot be understood.
+    """
+    words = value.upper().split()
+    circa = bool(words) and words[0] in _APPROXIMATE
+    match = _DATE.match(" ".join(words[1:] if circa else words))
+    if match is None:
+        return None
+
+    month_name = match.group("month")
+    if month_name is not None and month_name not in MONTHS:
+        return None
+    year = int(match.group("year"))
+    parts = [match.group("year").zfill(4)]
+    if month_name is not None:
+        month = MONTHS.index(month_name) + 1
+        parts.append(f"{month:02d}")
+        if match.group("day") is not None:
+            day = int(match.group("day"))
+            try:
+                date(year, month, day)
+            except ValueError:
+                pass
+            else:
+                parts.append(f"{day:02d}")
+    text = "-".join(parts)
+    return f"c. {text}" if circa else text
+
+
+def format_gedcom_date(value: DateLike) -> str:
+    """Converts a date into GEDCOM's date format."""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return f"{value.day} {MONTHS[value.month - 1]} {value.year}"
+
+    parts = [str(value.year)]
+    if value.month is not None:
+        parts.insert(0, MONTHS[value.month - 1])
+        if value.day is not None:
+            parts.insert(0, str(value.day))
+    text = " ".join(parts)
+    return f"ABT {text}" if value.circa else text
+
+
+def _read_links(
+    filepath: str,
+) -> Tuple[Dict[str, str], Dict[str, List[str]], Dict[str, List[str]]]:
+    """First pass: the REFN of each person and the links given by FAM records."""
+    identifiers: Dict[str, str] = {}
+    parents_of: Dict[str, List[str]] = {}
+    spouses_of: Dict[str, List[str]] = {}
+    for xref, lines in _records(filepath, "INDI", "FAM"):
+        if lines[0].tag == "INDI":
+            for line in lines:
+                if line.level == 1 and line.tag == "REFN" and line.value:
+                    identifiers[xref] = line.value
+                    break
+            continue
+
+        partners = [
+            line.value for line in lines if line.level == 1 and line.tag in _PARTNERS
+        ]
+        for line in lines:
+            # Only the first family a child belongs to gives their parents
+            if line.level == 1 and line.tag == "CHIL":
+                parents_of.setdefault(line.value, partners)
+        for partner in partners:
+            spouses = spouses_of.setdefault(partner, [])
+            spouses.extend(
+                other for other in partners if other != partner and other not in spouses
+            )
+    return identifiers, parents_of, spouses_of
+
+
+def _records(filepath: str, *tags: str) -> Iterator[Tuple[str, List[GedcomLine]]]:
+    """Yields the xref and lines of each level 0 record with one of the tags."""
+    with open(filepath, encoding="utf-8-sig") as f:
+        yield from _group_records(f, tags)
+
+
+def _group_records(
+    lines: Iterable[str], tags: Tuple[str, ...]
+) -> Iterator[Tuple[str, List[GedcomLine]]]:
+    """Groups lines into records, keeping only records with one of the tags."""
+    record: List[GedcomLine] = []
+    for text in lines:
+        if not text.strip():
+            continue
+        line = parse_line(text)
+        if line.level == 0:
+            if record:
+                yield record[0].xref, record  # type: ignore
+            record = [line] if line.xref and line.tag in tags else []
+        elif record:
+            record.append(line)
+    if record:
+        yield record[0].xref, record  # type: ignore
+
+
+def _person_facts(lines: List[GedcomLine]) -> Dict[str, Optional[str]]:
+    """Picks the first name, birth and death details out of an INDI record."""
+    facts: Dict[str, Optional[str]] = dict.fromkeys(
+        ["NAME", "BIRT.DATE", "BIRT.PLAC", "DEAT.DATE"]
+    )
+    event = None
+    for line in lines[1:]:
+        if line.level == 1:
+            event = line.tag
+            if line.tag == "NAME" and facts["NAME"] is None:
+                # Surnames are marked with slashes, e.g. "John /Doe/"
+                facts["NAME"] = " ".join(line.value.replace("/", " ").split())
+        elif line.level == 2 and event in ("BIRT", "DEAT"):
+            key = f"{event}.{line.tag}"
+            if key in facts and facts[key] is None:
+                value = line.value
+                facts[key] = parse_gedcom_date(value) if line.tag == "DATE" else value
+    return facts
+
+
+def _family_key(*partners: str) -> Tuple[str, ...]:
+    """The key of the FAM record for the given partners or parents."""
+    return tuple(sorted(set(partners)))[:2]
+
+
+def _write_event(
+    out: TextIO, tag: str, when: Optional[DateLike], place: Optional[str]
+) -> None:
+    """Writes a BIRT or DEAT event, if anything is known about it."""
+    if when is None and place is None:
+        return
+    out.write(f"1 {tag}\n")
+    if when is not None:
+        out.write(f"2 DATE {format_gedcom_date(when)}\n")
+    if place is not None:
+        out.write(f"2 PLAC {place}\n")
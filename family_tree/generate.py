@@ -0,0 +1,204 @@
+"""This module contains a seeded generator of synthetic families for testing."""
+from __future__ import annotations
+
+import random
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from family_tree import Family, Person
+
+FIRST_NAMES = [
+    "Ada",
+    "Albert",
+    "Alice",
+    "Arthur",
+    "Edith",
+    "Edward",
+    "Florence",
+    "George",
+    "Harriet",
+    "Henry",
+    "Mary",
+    "Thomas",
+]
+SURNAMES = ["Baker", "Clarke", "Doe", "Evans", "Jones", "Smith", "Taylor", "Walker"]
+PLACES = ["Bristol", "Leeds", "London", "Manchester", "York", None]
+
+
+def generate_records(
+    size: int,
+    generations: int = 5,
+    remarriage_rate: float = 0.1,
+    collapse_rate: float = 0.05,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Generates a synthetic pedigree as records in the json input format.
+
+    The people are split evenly over the generations. Each generation is paired
+    into couples, and every person in the next generation is the child of one of
+    those couples.
+
+    Args:
+        size: Number of people to generate.
+        generations: Number of generations, i.e. the depth of the tree.
+        remarriage_rate: Chance that a couple is followed by a second marriage.
+        collapse_rate: Chance that someone marries a cousin where one is free.
+        seed: Seed for the random number generator.
+
+    Returns:
+        List of records, oldest generation first.
+    """
+    pedigree = _Pedigree(random.Random(seed))
+    per_generation = -(-size // generations)
+
+    current = [pedigree.person(0, ()) for _ in range(min(per_generation, size))]
+    while len(pedigree.records) < size:
+        couples = pedigree.marry(current, remarriage_rate, collapse_rate)
+        if not couples:
+            break
+        count = min(per_generation, size - len(pedigree.records))
+        generation = pedigree.records[current[0]]["generation"] + 1
+        current = [
+            pedigree.person(generation, pedigree.rng.choice(couples))
+            for _ in range(count)
+        ]
+
+    for record in pedigree.records.values():
+        del record["generation"]
+    return list(pedigree.records.values())
+
+
+def generate_people(size: int, **kwargs: Any) -> List[Person]:
+    """Generates a synthetic pedigree as people. Takes the same arguments as
+    generate_records."""
+    return [Person(**record) for record in generate_records(size, **kwargs)]
+
+
+def generate_family(size: int, **kwargs: Any) -> Family:
+    """Generates a synthetic Family. Takes the same arguments as generate_records."""
+    family = Family()
+    family.add_people(generate_people(size, **kwargs))
+    return family
+
+
+class _Pedigree:
+    """Helper class holding the records while a pedigree is generated."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._grandchildren: Dict[str, List[str]] = {}
+
+    def person(self, generation: int, parents: Tuple[str, ...]) -> str:
+        """Adds a new person record and returns their identifier."""
+        rng = self.rng
+        identifier = f"I{len(self.records)}"
+        surname = (
+            self.records[parents[0]]["name"].split()[-1]
+            if parents
+            else rng.choice(SURNAMES)
+        )
+        year = 1700 + 25 * generation + rng.randint(-5, 5)
+        dob: Optional[str] = date(
+            year, rng.randint(1, 12), rng.randint(1, 28)
+        ).isoformat()
+        if rng.random() < 0.1:
+            dob = f"c. {year}"
+        dod = str(year + rng.randint(20, 90)) if rng.random() < 0.5 else None
+
+        self.records[identifier] = {
+            "identifier": identifier,
+            "name": f"{rng.choice(FIRST_NAMES)} {surname}",
+            "dob": dob,
+            "dod": dod,
+            "parents": list(parents),
+            "spouses": [],
+            "birth_place": rng.choice(PLACES),
+            "generation": generation,
+        }
+        for parent in parents:
+            for grandparent in self.records[parent]["parents"]:
+                self._grandchildren.setdefault(grandparent, []).append(identifier)
+        return identifier
+
+    def marry(
+        self, people: List[str], remarriage_rate: float, collapse_rate: float
+    ) -> List[Tuple[str, str]]:
+        """Pairs up a generation, returning the couples that were formed."""
+        rng = self.rng
+        unmarried = list(people)
+        rng.shuffle(unmarried)
+        free = set(unmarried)
+        # Lazily skips anyone who has married since the list was shuffled
+        pending = (person for person in unmarried if person in free)
+        # People passed over as the spouse of a sibling, still free
+        deferred: List[str] = []
+        couples = []
+        while True:
+            person = self._next_free(pending, deferred, free)
+            if person is None:
+                break
+            free.discard(person)
+            spouse = None
+            if rng.random() < collapse_rate:
+                spouse = self._free_cousin(person, free)
+            if spouse is None:
+                spouse = self._next_free(pending, deferred, free, person)
+            if spouse is None:
+                break
+            free.discard(spouse)
+            couples.append(self._wed(person, spouse))
+
+            if rng.random() < remarriage_rate and len(people) > 2:
+                second = rng.choice(people)
+                spouses = self.records[person]["spouses"]
+                if (
+                    second != person
+                    and second not in spouses
+                    and not self._siblings(person, second)
+                ):
+                    couples.append(self._wed(person, second))
+        return couples
+
+    def _next_free(
+        self,
+        pending: Iterator[str],
+        deferred: List[str],
+        free: Set[str],
+        unrelated_to: Optional[str] = None,
+    ) -> Optional[str]:
+        """Takes the next free person, skipping any siblings of unrelated_to.
+
+        Skipped siblings are deferred so they are still paired up later.
+        """
+        deferred[:] = [person for person in deferred if person in free]
+        for position, person in enumerate(deferred):
+            if unrelated_to is None or not self._siblings(person, unrelated_to):
+                del deferred[position]
+                return person
+        for person in pending:
+            if unrelated_to is None or not self._siblings(person, unrelated_to):
+                return person
+            deferred.append(person)
+        return None
+
+    def _siblings(self, left: str, right: str) -> bool:
+        """Whether two people share at least one parent."""
+        parents = self.records[left]["parents"]
+        return any(parent in parents for parent in self.records[right]["parents"])
+
+    def _free_cousin(self, person: str, free: Set[str]) -> Optional[str]:
+        """Finds an unmarried cousin, to simulate pedigree collapse."""
+        parents = self.records[person]["parents"]
+        for parent in parents:
+            for grandparent in self.records[parent]["parents"]:
+                for cousin in self._grandchildren.get(grandparent, []):
+                    if cousin in free and not self._siblings(person, cousin):
+                        return cousin
+        return None
+
+    def _wed(self, left: str, right: str) -> Tuple[str, str]:
+        """Records a marriage on both people."""
+        self.records[left]["spouses"].append(right)
+        self.records[right]["spouses"].append(left)
+        return left, right
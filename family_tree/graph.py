@@ -0,0 +1,172 @@
+"""This module contains the compiled, integer indexed view of a Family's links.
+
+Each identifier is numbered, members first in the order they were added and
+then any parents who have not been added. Parent, child and spouse links are
+each stored in compressed sparse row (CSR) form:
+
+* offsets: start of each person's links, plus a final end offset.
+* targets: numbers of the linked people, one run per person.
+
+Traversals expand a whole frontier of people at once with NumPy, instead of
+hashing one identifier at a time.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from family_tree.optional import require_numpy
+
+if TYPE_CHECKING:
+    from family_tree import Family
+
+
+class CompiledGraph:
+    """Read-only, integer indexed copy of a family's parent, child and spouse links.
+
+    The graph is a snapshot of the family when it was compiled. Use
+    Family.compile to get one that is kept up to date.
+
+    Attributes:
+        identifiers: Identifier of each number, members first.
+        index: Number of each identifier.
+        member_count: Number of members. Higher numbers are parents who have not
+            been added to the family.
+    """
+
+    def __init__(self, family: Family) -> None:
+        """Compiles the links of a family.
+
+        Args:
+            family: Family to compile.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        np = self._np = require_numpy("compile the family graph")
+        self.identifiers: List[str] = list(family.members)
+        self.index: Dict[str, int] = {
+            identifier: i for i, identifier in enumerate(self.identifiers)
+        }
+        self.member_count = len(self.identifiers)
+
+        children, parents = [], []
+        for identifier, parent_ids in family.parents_of.items():
+            child = self.index[identifier]
+            for parent in parent_ids:
+                children.append(child)
+                parents.append(self._number(parent))
+
+        left, right = [], []
+        for couple in family.couples.values():
+            left.append(self.index[couple.left.identifier])
+            right.append(self.index[couple.right.identifier])
+
+        children_array = np.array(children, dtype=np.int64)
+        parents_array = np.array(parents, dtype=np.int64)
+        spouses = np.array(left + right, dtype=np.int64)
+        partners = np.array(right + left, dtype=np.int64)
+        self.parents = self._csr(children_array, parents_array)
+        self.children = self._csr(parents_array, children_array)
+        self.spouses = self._csr(spouses, partners)
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
+
+    def to_identifiers(self, numbers: Iterable[int]) -> List[str]:
+        """Converts numbers back to identifiers."""
+        return [self.identifiers[number] for number in numbers]
+
+    def ancestors(self, identifier: str, max_generations: Optional[int] = None) -> Any:
+        """Lists the numbers of a person's ancestors, a generation at a time.
+
+        Args:
+            identifier: Unique identifier of the person.
+            max_generations: Stop after this many generations. Defaults to all.
+
+        Returns:
+            List of sorted numpy arrays, parents first.
+        """
+        return self._generations(self.parents, identifier, max_generations)
+
+    def descendants(
+        self, identifier: str, max_generations: Optional[int] = None
+    ) -> Any:
+        """Lists the numbers of a person's descendants, a generation at a time.
+
+        Args:
+            identifier: Unique identifier of the person.
+            max_generations: Stop after this many generations. Defaults to all.
+
+        Returns:
+            List of sorted numpy arrays, children first.
+        """
+        return self._generations(self.children, identifier, max_generations)
+
+    def distances(self, identifier: str, max_depth: Optional[int] = None) -> Any:
+        """Breadth first search over parent, child and spouse links.
+
+        Args:
+            identifier: Unique identifier of the person to start from.
+            max_depth: Stop after this many links. Defaults to no limit.
+
+        Returns:
+            numpy array of the number of links to each person, or -1 if they
+            cannot be reached.
+        """
+        np = self._np
+        distances = np.full(len(self), -1, dtype=np.int64)
+        frontier = np.array([self.index[identifier]], dtype=np.int64)
+        distances[frontier] = 0
+        depth = 0
+        while frontier.size and (max_depth is None or depth < max_depth):
+            depth += 1
+            reached = np.concatenate(
+                [
+                    _expand(np, links, frontier)
+                    for links in (self.parents, self.children, self.spouses)
+                ]
+            )
+            frontier = np.unique(reached[distances[reached] < 0])
+            distances[frontier] = depth
+        return distances
+
+    def _generations(
+        self, links: Tuple[Any, Any], identifier: str, max_generations: Optional[int]
+    ) -> List[Any]:
+        """Repeatedly expands a frontier along one kind of link."""
+        np = self._np
+        frontier = np.array([self.index[identifier]], dtype=np.int64)
+        generations: List[Any] = []
+        while max_generations is None or len(generations) < max_generations:
+            frontier = np.unique(_expand(np, links, frontier))
+            if not frontier.size:
+                break
+            if len(generations) == len(self):
+                raise ValueError(f"{identifier} is linked to their own ancestor.")
+            generations.append(frontier)
+        return generations
+
+    def _number(self, identifier: str) -> int:
+        """Returns the number of an identifier, numbering it if it is new."""
+        if (number := self.index.get(identifier)) is None:
+            number = self.index[identifier] = len(self.identifiers)
+            self.identifiers.append(identifier)
+        return number
+
+    def _csr(self, sources: Any, targets: Any) -> Tuple[Any, Any]:
+        """Groups the targets by source into offsets and targets arrays."""
+        np = self._np
+        offsets = np.zeros(len(self) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(self)), out=offsets[1:])
+        return offsets, targets[np.argsort(sources, kind="stable")]
+
+
+def _expand(np: Any, links: Tuple[Any, Any], frontier: Any) -> Any:
+    """Gathers the links of every person in the frontier in one step."""
+    offsets, targets = links
+    starts = offsets[frontier]
+    lengths = offsets[frontier + 1] - starts
+    # Position within each run, shifted to the start of that run
+    run_starts = np.cumsum(lengths) - lengths
+    positions = np.arange(lengths.sum()) + np.repeat(starts - run_starts, lengths)
+    return targets[positions]
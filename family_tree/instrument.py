@@ -0,0 +1,168 @@
+"""This module contains the opt-in profiler used to time each phase of a run."""
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_active: ContextVar[Optional[Profiler]] = ContextVar("profiler", default=None)
+
+
+class PhaseRecord:
+    """The measurements taken for one phase.
+
+    Attributes:
+        name: Name of the phase, prefixed by the names of any enclosing phases.
+        seconds: Wall time taken.
+        count: Number of items processed, if known.
+        peak_memory: Peak traced memory in bytes, if memory was traced.
+    """
+
+    def __init__(self, name: str, count: Optional[int] = None) -> None:
+        self.name = name
+        self.seconds = 0.0
+        self.count = count
+        self.peak_memory: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"{self.name}: {self.seconds:.4f}s"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the record as a json serialisable dict."""
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "count": self.count,
+            "peak_memory": self.peak_memory,
+        }
+
+
+class Profiler:
+    """Records the wall time, item count and peak memory of each phase.
+
+    Loading, linking and rendering report their phases to the profiler that is
+    active when they run. Outside of a profiler the phases are not measured.
+
+    Attributes:
+        records: Records of the completed phases, in the order they finished.
+
+    Example:
+        with Profiler() as profiler:
+            family = Family.from_json("family.json")
+            FamilyGraph(family, "dot").render_family()
+        print(profiler.to_json())
+    """
+
+    def __init__(
+        self,
+        trace_memory: bool = True,
+        callback: Optional[Callable[[PhaseRecord], None]] = None,
+    ) -> None:
+        """Creates a Profiler instance.
+
+        Args:
+            trace_memory: Whether to record peak memory with tracemalloc. This
+                slows down the code being profiled.
+            callback: Called with each record as its phase finishes.
+        """
+        self.records: List[PhaseRecord] = []
+        self._trace_memory = trace_memory
+        self._callback = callback
+        self._stack: List[PhaseRecord] = []
+        self._started_tracing = False
+        self._token: Any = None
+
+    def __enter__(self) -> Profiler:
+        # Imported here, as it is slow to import and only needed while profiling
+        import tracemalloc
+
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        import tracemalloc
+
+        _active.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str, count: Optional[int] = None) -> Iterator[PhaseRecord]:
+        """Measures the code run inside the with block as one phase.
+
+        Args:
+            name: Name of the phase.
+            count: Number of items processed. Can also be set on the record.
+
+        Yields:
+            The record for the phase.
+        """
+        import tracemalloc
+
+        parent = self._stack[-1] if self._stack else None
+        record = PhaseRecord(f"{parent.name}.{name}" if parent else name, count)
+        tracing = self._trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # The peak is reset per phase, so pass the parent's peak so far up first
+            if parent:
+                parent.peak_memory = max(
+                    parent.peak_memory or 0, tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+
+        self._stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            self._stack.pop()
+            if tracing:
+                record.peak_memory = max(
+                    record.peak_memory or 0, tracemalloc.get_traced_memory()[1]
+                )
+                if parent:
+                    parent.peak_memory = max(
+                        parent.peak_memory or 0, record.peak_memory
+                    )
+            self.records.append(record)
+            if self._callback:
+                self._callback(record)
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        """Returns all the records as json serialisable dicts."""
+        return [record.to_dict() for record in self.records]
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Returns all the records as a json string.
+
+        Args:
+            **kwargs: Passed on to json.dumps.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+@contextmanager
+def phase(name: str, count: Optional[int] = None) -> Iterator[Optional[PhaseRecord]]:
+    """Measures a phase if a Profiler is active, otherwise does nothing.
+
+    Args:
+        name: Name of the phase.
+        count: Number of items processed. Can also be set on the record.
+
+    Yields:
+        The record for the phase, or None if no Profiler is active.
+    """
+    profiler = _active.get()
+    if profiler is None:
+        yield None
+        return
+
+    with profiler.phase(name, count) as record:
+        yield record
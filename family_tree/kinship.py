@@ -0,0 +1,121 @@
+"""This module contains the kinship coefficient calculations used by Family.
+
+Kinship is calculated with the tabular method. Everyone involved is numbered so
+that parents come before their children, then the table is filled in a whole
+generation at a time with NumPy, using:
+
+* the kinship of a person with anyone earlier is the mean of their parents'
+  kinship with that person.
+* the kinship of a person with themselves is half of one plus their parents'
+  kinship with each other.
+
+Parents who have not been added to the family are treated as unrelated founders,
+so siblings who name the same missing parents are still full siblings.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+from family_tree.optional import require_numpy
+
+if TYPE_CHECKING:
+    from family_tree import Family
+
+
+def kinship_matrix(family: Family, identifiers: Sequence[str]) -> Any:
+    """Calculates the kinship coefficient between every pair of people.
+
+    The table covers the people and all of their ancestors, so memory grows with
+    the square of that number, at eight bytes per entry.
+
+    Args:
+        family: Family the people belong to.
+        identifiers: Unique identifiers of members of the family.
+
+    Returns:
+        numpy.ndarray: Square matrix of coefficients, in the order given.
+
+    Raises:
+        KeyError: If an identifier is not a member of the family.
+        ValueError: If a person turns out to be their own ancestor.
+        ImportError: If numpy is not installed.
+    """
+    np = require_numpy("calculate kinship coefficients")
+    for identifier in identifiers:
+        if identifier not in family.members:
+            raise KeyError(identifier)
+
+    layers = _layers(family, identifiers)
+    order = [identifier for layer in layers for identifier in layer]
+    index = {identifier: i for i, identifier in enumerate(order)}
+    # One extra row and column of zeros stands in for unknown parents
+    unknown = len(order)
+    first = np.full(unknown, unknown)
+    second = np.full(unknown, unknown)
+    for i, identifier in enumerate(order):
+        parents = list(dict.fromkeys(family.parents_of.get(identifier, ())))
+        if parents:
+            first[i] = index[parents[0]]
+        if len(parents) > 1:
+            second[i] = index[parents[1]]
+
+    table = np.zeros((unknown + 1, unknown + 1))
+    start = 0
+    for layer in layers:
+        end = start + len(layer)
+        first_rows, second_rows = first[start:end], second[start:end]
+        # Nobody in a layer is an ancestor of anyone else in it, so the whole
+        # layer is filled from the rows of the earlier layers.
+        table[start:end, :start] = 0.5 * (
+            table[first_rows, :start] + table[second_rows, :start]
+        )
+        table[:start, start:end] = table[start:end, :start].T
+        table[start:end, start:end] = 0.5 * (
+            table[first_rows, start:end] + table[second_rows, start:end]
+        )
+        positions = np.arange(start, end)
+        table[positions, positions] = 0.5 * (1 + table[first_rows, second_rows])
+        start = end
+
+    wanted = [index[identifier] for identifier in identifiers]
+    return table[np.ix_(wanted, wanted)]
+
+
+def _layers(family: Family, identifiers: Sequence[str]) -> List[List[str]]:
+    """Groups the people and all their ancestors into generations, oldest first.
+
+    Everyone is placed one generation below their latest parent, using Kahn's
+    topological sort.
+    """
+    parents_of = family.parents_of
+    waiting: Dict[str, int] = {}
+    children: Dict[str, List[str]] = {}
+    stack = list(dict.fromkeys(identifiers))
+    for identifier in stack:
+        waiting[identifier] = 0
+    while stack:
+        identifier = stack.pop()
+        for parent in dict.fromkeys(parents_of.get(identifier, ())):
+            waiting[identifier] += 1
+            children.setdefault(parent, []).append(identifier)
+            if parent not in waiting:
+                waiting[parent] = 0
+                stack.append(parent)
+
+    layers: List[List[str]] = []
+    layer = [identifier for identifier, count in waiting.items() if not count]
+    placed = 0
+    while layer:
+        layers.append(layer)
+        placed += len(layer)
+        next_layer = []
+        for parent in layer:
+            for child in children.get(parent, ()):
+                waiting[child] -= 1
+                if not waiting[child]:
+                    next_layer.append(child)
+        layer = next_layer
+
+    if placed != len(waiting):
+        raise ValueError("A person in the family is listed as their own ancestor.")
+    return layers
@@ -0,0 +1,18 @@
+"""This module contains the imports of optional dependencies."""
+from typing import Any
+
+
+def require_numpy(purpose: str) -> Any:
+    """Imports numpy, which is only needed for some calculations.
+
+    Args:
+        purpose: What numpy is needed for, e.g. "calculate kinship coefficients".
+
+    Raises:
+        ImportError: If numpy is not installed, saying what it is needed for.
+    """
+    try:
+        import numpy  # type: ignore
+    except ImportError:
+        raise ImportError(f"Install numpy to {purpose}.") from None
+    return numpy
@@ -1,23 +1,45 @@
 """This module contains the Person class used to represent a single person."""
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional, Union, List
+import sys
+from typing import Iterable, Optional, Sequence, Tuple, Union
 
-import pandas as pd  # type: ignore
+from family_tree.dates import DateLike, format_date, parse_date
 
 
 class Person:
-    """Represents a single person."""
+    """Represents a single person.
+
+    Attributes:
+        identifier (str): Unique identifier.
+        name (str): Full name.
+        parents (Tuple[str, ...]): Identifiers of the parents.
+        spouses (Tuple[str, ...]): Identifiers of the spouses.
+        birth_place (Optional[str]): Place of birth.
+
+    Note:
+        Identifiers are interned and parents and spouses are stored as tuples to
+        keep large families compact.
+    """
+
+    __slots__ = (
+        "identifier",
+        "name",
+        "_dob",
+        "_dod",
+        "_parents",
+        "_spouses",
+        "birth_place",
+    )
 
     def __init__(
         self,
         identifier: str,
         name: str,
-        dob: Optional[Union[datetime, str]] = None,
-        dod: Optional[Union[datetime, str]] = None,
-        parents: Optional[List[str]] = None,
-        spouses: Optional[List[str]] = None,
+        dob: Optional[Union[DateLike, str]] = None,
+        dod: Optional[Union[DateLike, str]] = None,
+        parents: Optional[Sequence[str]] = None,
+        spouses: Optional[Sequence[str]] = None,
         birth_place: Optional[str] = None,
     ) -> None:
         """Creates a Person instance.
@@ -25,18 +47,20 @@ class Person:
         Args:
             identifier (str): Unique identifier.
             name (str): Full name.
-            dob (Optional[Union[datetime, str]]): Date of Birth. Defaults to None.
-            dod (Optional[Union[datetime, str]]): Date of Death. Defaults to None.
-            parents (Optional[List[str]]): List of parental names. Defaults to None.
-            spouses (Optional[List[str]]): List of spousal names. Defaults to None.
+            dob (Optional[Union[DateLike, str]]): Date of Birth. Defaults to None.
+            dod (Optional[Union[DateLike, str]]): Date of Death. Defaults to None.
+            parents (Optional[Sequence[str]]): Identifiers of the parents, stored as
+                a tuple. Defaults to None.
+            spouses (Optional[Sequence[str]]): Identifiers of the spouses, stored as
+                a tuple. Defaults to None.
             birth_place (Optional[str]). Defaults to None.
         """
-        self.identifier = identifier
+        self.identifier = sys.intern(identifier)
         self.name = name
         self.dob = dob
         self.dod = dod
-        self.parents: List[str] = parents if parents else []
-        self.spouses: List[str] = spouses if spouses else []
+        self.parents = parents
+        self.spouses = spouses
         self.birth_place = birth_place
 
     def __eq__(self, o: object) -> bool:
@@ -54,28 +78,59 @@ class Person:
         return hash(self.identifier)
 
     @property
-    def dob(self) -> pd.Timestamp:
+    def dob(self) -> Optional[DateLike]:
         return self._dob
 
     @dob.setter
-    def dob(self, value: object) -> None:  # type: ignore
-        self._dob: pd.Timestamp = pd.to_datetime(value)  # type: ignore
+    def dob(self, value: object) -> None:
+        self._dob = parse_date(value)
 
     @property
-    def dod(self) -> pd.Timestamp:
+    def dod(self) -> Optional[DateLike]:
         return self._dod
 
     @dod.setter
-    def dod(self, value: object) -> None:  # type: ignore
-        self._dod: pd.Timestamp = pd.to_datetime(value)  # type: ignore
+    def dod(self, value: object) -> None:
+        self._dod = parse_date(value)
+
+    @property
+    def parents(self) -> Tuple[str, ...]:
+        return self._parents
+
+    @parents.setter
+    def parents(self, value: Optional[Iterable[str]]) -> None:
+        self._parents = _intern_all(value)
+
+    @property
+    def spouses(self) -> Tuple[str, ...]:
+        return self._spouses
+
+    @spouses.setter
+    def spouses(self, value: Optional[Iterable[str]]) -> None:
+        self._spouses = _intern_all(value)
+
+    def content_hash(self) -> int:
+        """Returns a hash of all the person's details, unlike __hash__ which only
+        uses the identifier."""
+        return hash(
+            (
+                self.identifier,
+                self.name,
+                self._dob,
+                self._dod,
+                self._parents,
+                self._spouses,
+                self.birth_place,
+            )
+        )
 
     def dob_string(self) -> str:
         """Returns the date of birth as a formatted string."""
-        return f"b. {str(self.dob.date())}"
+        return f"b. {format_date(self.dob)}"  # type: ignore
 
     def dod_string(self) -> str:
         """Returns the date of death as a formatted string."""
-        return f"d. {str(self.dod.date())}"
+        return f"d. {format_date(self.dod)}"  # type: ignore
 
     def to_html(self) -> str:
         """Renders the person's information in html format.
@@ -110,3 +165,8 @@ class Person:
             lines.append(self.birth_place)
 
         return "<br/>".join(lines)
+
+
+def _intern_all(identifiers: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Helper function for storing identifiers compactly."""
+    return tuple(map(sys.intern, identifiers)) if identifiers else ()
@@ -0,0 +1,223 @@
+"""This module contains the cached, non-viewing rendering backend for graphs."""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+from graphviz import Source  # type: ignore
+
+if TYPE_CHECKING:
+    from family_tree import FamilyGraph
+
+
+class RenderCache:
+    """Stores rendered outputs on disk, keyed by a hash of their DOT source.
+
+    The least recently used outputs are deleted once the files take up more
+    than max_bytes. The cache is safe to share between threads.
+
+    Attributes:
+        directory: Folder the cached files are kept in.
+        max_bytes: Maximum total size of the cached files.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 ** 2) -> None:
+        """Creates a RenderCache, picking up any files already in the directory.
+
+        Args:
+            directory: Folder to keep the cached files in. Created if missing.
+            max_bytes: Maximum total size of the cached files.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        entries = [
+            entry
+            for entry in os.scandir(directory)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        self._sizes: OrderedDict[str, int] = OrderedDict(
+            (entry.name, entry.stat().st_size) for entry in entries
+        )
+        self._total = sum(self._sizes.values())
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached files."""
+        return self._total
+
+    @staticmethod
+    def key(source: str, layout: str, format: str) -> str:
+        """Returns the name a rendered output is cached under."""
+        digest = hashlib.sha256(f"{layout}\n{format}\n{source}".encode("utf-8"))
+        return f"{digest.hexdigest()}.{format}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns a cached output and marks it as recently used.
+
+        Args:
+            key: Name returned by RenderCache.key.
+
+        Returns:
+            The rendered output, or None if it is not cached.
+        """
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            path = os.path.join(self.directory, key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                # Removed from outside the cache
+                self._total -= self._sizes.pop(key)
+                return None
+            self._sizes.move_to_end(key)
+            os.utime(path)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Adds an output to the cache, evicting old outputs to make room.
+
+        Args:
+            key: Name returned by RenderCache.key.
+            data: The rendered output.
+        """
+        # Written to a temporary file first so readers never see a partial file
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            os.replace(temporary, os.path.join(self.directory, key))
+            self._total += len(data) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            while self._total > self.max_bytes and self._sizes:
+                oldest, size = self._sizes.popitem(last=False)
+                self._total -= size
+                try:
+                    os.remove(os.path.join(self.directory, oldest))
+                except FileNotFoundError:
+                    pass
+
+
+def render_source(
+    source: str, layout: str, format: str, cache: Optional[RenderCache] = None
+) -> bytes:
+    """Renders DOT source with graphviz, without opening a viewer.
+
+    Args:
+        source: DOT source to render.
+        layout: The graphviz layout option.
+        format: The graphviz output format, e.g. "pdf" or "svg".
+        cache: Cache to serve the output from, or store it in if missing.
+
+    Returns:
+        The rendered output.
+    """
+    key = RenderCache.key(source, layout, format)
+    if cache is not None and (data := cache.get(key)) is not None:
+        return data
+
+    data = _pipe(source, layout, format)
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def write_output(path: str, data: bytes) -> str:
+    """Writes a rendered output to path, returning the path."""
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+class RenderWorker:
+    """Renders graphs on a pool of background threads.
+
+    Graphviz runs in its own process, so threads are enough to render several
+    graphs at once. At most max_pending renders are queued or running; submit
+    blocks until there is room, so a busy server cannot build up an unbounded
+    backlog.
+
+    Example:
+        with RenderWorker(RenderCache("cache")) as worker:
+            future = worker.submit(FamilyGraph(family, "dot"), "family.svg", "svg")
+        print(future.result())
+    """
+
+    def __init__(
+        self,
+        cache: Optional[RenderCache] = None,
+        max_workers: Optional[int] = None,
+        max_pending: int = 64,
+    ) -> None:
+        """Creates a RenderWorker.
+
+        Args:
+            cache: Cache shared by every render.
+            max_workers: Maximum number of threads. Defaults to the
+                ThreadPoolExecutor default.
+            max_pending: Maximum number of renders queued or running at once.
+        """
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers, "render")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def __enter__(self) -> RenderWorker:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+    def submit(
+        self, family_graph: FamilyGraph, path: str, format: str = "pdf"
+    ) -> Future[str]:
+        """Queues a graph to be rendered to a file.
+
+        The DOT source is generated straight away, so the graph can be changed
+        again as soon as this returns.
+
+        Args:
+            family_graph: Graph to render.
+            path: Path of the file to produce.
+            format: The graphviz output format, e.g. "pdf" or "svg".
+
+        Returns:
+            Future that resolves to the path of the rendered file.
+        """
+        source = family_graph.source
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(
+                self._render, source, family_graph.layout, format, path
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the threads once the queued renders are done."""
+        self._executor.shutdown(wait)
+
+    def _render(self, source: str, layout: str, format: str, path: str) -> str:
+        """Renders one graph in a worker thread."""
+        return write_output(path, render_source(source, layout, format, self.cache))
+
+
+def _pipe(source: str, layout: str, format: str) -> bytes:
+    """Runs graphviz on the source and returns its output."""
+    return Source(source, engine=layout).pipe(format=format)  # type: ignore
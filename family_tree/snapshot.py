@@ -0,0 +1,419 @@
+"""This module contains the binary snapshot format used to save and reload a Family.
+
+A snapshot is a single file made of a header followed by flat arrays, so it can be
+memory-mapped and read without parsing the whole file. Every string is stored
+once in a string table and referred to everywhere else by its integer index.
+
+Each of the family's lookups (members, children, couples, the couples of each
+person, pending spouses and the two halves of the lineage union-find) is stored
+as a table of four arrays:
+
+* keys: string index of each key, in the family's insertion order.
+* order: positions of the keys sorted by key, for binary search.
+* offsets: start of each key's values, plus a final end offset.
+* values: string indices of all the values, one run per key.
+
+Couples are keyed by their two identifiers joined with a unit separator.
+"""
+from __future__ import annotations
+
+import mmap
+import sys
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from family_tree import Couple, Person
+from family_tree.dates import date_text
+
+if TYPE_CHECKING:
+    from family_tree import Family
+
+MAGIC = b"FTSNAP03"
+NONE = 0xFFFFFFFF
+TABLES = (
+    "members",
+    "children",
+    "pending_spouses",
+    "couples",
+    "couples_of",
+    "component_parents",
+    "component_sizes",
+)
+# String offsets, string data, then the four arrays of each table
+_SECTIONS = 2 + 4 * len(TABLES)
+_HEADER = len(MAGIC) + 8 + _SECTIONS * 16
+_KEY_SEPARATOR = "\x1f"
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def save_snapshot(family: Family, path: str) -> None:
+    """Writes the family to a binary snapshot file.
+
+    Args:
+        family: Family to save.
+        path: Location of the snapshot file.
+    """
+    strings = _StringTable()
+    tables = [
+        _build_table(strings, family.items(), _person_values),
+        _build_table(strings, family.children_of.items(), lambda v: v),
+        _build_table(
+            strings,
+            family._pending_spouses.items(),
+            lambda v: [person.identifier for person in v],
+        ),
+        _build_table(
+            strings,
+            (
+                (_KEY_SEPARATOR.join(key), couple)
+                for key, couple in family.couples.items()
+            ),
+            lambda v: [v.left.identifier, v.right.identifier],
+        ),
+        _build_table(
+            strings,
+            (
+                (identifier, [_partner(couple, identifier) for couple in couples])
+                for identifier, couples in family._couples_of.items()
+            ),
+            lambda v: v,
+        ),
+        _build_table(strings, family._component_parent.items(), lambda v: [v]),
+        _build_table(strings, family._component_size.items(), lambda v: [str(v)]),
+    ]
+
+    sections: List[bytes] = [strings.offsets.tobytes(), strings.data]
+    for table in tables:
+        sections.extend(part.tobytes() for part in table)
+
+    header = array("Q")
+    position = _HEADER
+    for section in sections:
+        header.extend([position, len(section)])
+        # Keeps every array 8 byte aligned
+        position += len(section) + (-len(section) % 8)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(sys.byteorder.ljust(8).encode("ascii"))
+        f.write(header.tobytes())
+        for section in sections:
+            f.write(section)
+            f.write(bytes(-len(section) % 8))
+
+
+def load_snapshot(family: Family, path: str) -> None:
+    """Points the family's lookups at a memory-mapped snapshot file.
+
+    Nothing is read up front; people, couples and index entries are materialised
+    the first time they are looked up.
+
+    Args:
+        family: Empty Family to load into.
+        path: Location of the snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot written on a compatible machine.
+    """
+    reader = SnapshotReader(path)
+    family.members = SnapshotMapping(reader.tables[0], reader.person)
+    family._parents_of = SnapshotMapping(
+        reader.tables[0], lambda i: family.members[reader.tables[0].key(i)].parents
+    )
+    family._children_of = SnapshotMapping(reader.tables[1], reader.tables[1].links)
+    family._pending_spouses = SnapshotMapping(
+        reader.tables[2],
+        lambda i: [family.members[key] for key in reader.tables[2].links(i)],
+    )
+    family._couples = SnapshotMapping(
+        reader.tables[3],
+        lambda i: Couple(*(family.members[key] for key in reader.tables[3].links(i))),
+        _KEY_SEPARATOR.join,
+        _decode_couple_key,
+    )
+    couples_of = reader.tables[4]
+    family._couples_of = SnapshotMapping(
+        couples_of,
+        lambda i: [
+            family.couples[_couple_key(couples_of.key(i), partner)]  # type: ignore
+            for partner in couples_of.values(i)
+        ],
+    )
+    family._component_parent = SnapshotMapping(
+        reader.tables[5], lambda i: reader.tables[5].links(i)[0]
+    )
+    family._component_size = SnapshotMapping(
+        reader.tables[6], lambda i: int(reader.tables[6].links(i)[0])
+    )
+
+
+class SnapshotReader:
+    """Reads the string table and lookup tables of a memory-mapped snapshot."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic_end = len(MAGIC)
+        header_start = magic_end + 8
+        if self._map[:magic_end] != MAGIC:
+            raise ValueError(f"{path} is not a family snapshot.")
+        byteorder = self._map[magic_end:header_start].decode("ascii").strip()
+        if byteorder != sys.byteorder:
+            raise ValueError(f"{path} was written on a {byteorder} endian machine.")
+
+        view = memoryview(self._map)
+        header = view[header_start:_HEADER].cast("Q")
+        sections = []
+        for i in range(_SECTIONS):
+            start = header[2 * i]
+            end = start + header[2 * i + 1]
+            sections.append(view[start:end])
+
+        self._offsets = sections[0].cast("Q")
+        self._data = sections[1]
+        self._strings: Dict[int, str] = {}
+        self.tables = []
+        for start in range(2, _SECTIONS, 4):
+            end = start + 4
+            arrays = (section.cast("I") for section in sections[start:end])
+            self.tables.append(_Table(self, *arrays))
+
+    def string(self, index: int) -> Optional[str]:
+        """Returns the string stored at the given index of the string table."""
+        if index == NONE:
+            return None
+        if (text := self._strings.get(index)) is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            text = sys.intern(str(self._data[start:end], "utf-8"))
+            self._strings[index] = text
+        return text
+
+    def person(self, position: int) -> Person:
+        """Materialises the person stored at the given position."""
+        table = self.tables[0]
+        name, dob, dod, birth_place, count, *relatives = table.values(position)
+        parents = int(count)  # type: ignore
+        return Person(
+            table.key(position),
+            name,  # type: ignore
+            dob,
+            dod,
+            relatives[:parents],  # type: ignore
+            relatives[parents:],  # type: ignore
+            birth_place,
+        )
+
+
+class _Table:
+    """One keyed lookup table of a snapshot."""
+
+    def __init__(
+        self,
+        reader: SnapshotReader,
+        keys: Sequence[int],
+        order: Sequence[int],
+        offsets: Sequence[int],
+        values: Sequence[int],
+    ) -> None:
+        self._reader = reader
+        self._keys = keys
+        self._order = order
+        self._offsets = offsets
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def key(self, position: int) -> str:
+        """Returns the key at the given position."""
+        return self._reader.string(self._keys[position])  # type: ignore
+
+    def keys(self) -> Iterator[str]:
+        """Iterates over the keys in their original order."""
+        return (self.key(position) for position in range(len(self._keys)))
+
+    def values(self, position: int) -> List[Optional[str]]:
+        """Returns the values stored against the key at the given position."""
+        start, end = self._offsets[position], self._offsets[position + 1]
+        return [self._reader.string(index) for index in self._values[start:end]]
+
+    def links(self, position: int) -> List[str]:
+        """Returns the values of a table that only holds identifiers, never None."""
+        return cast(List[str], self.values(position))
+
+    def find(self, key: str) -> Optional[int]:
+        """Binary searches for the position of a key."""
+        low, high = 0, len(self._order)
+        while low < high:
+            middle = (low + high) // 2
+            position = self._order[middle]
+            found = self.key(position)
+            if found == key:
+                return position
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+
+class SnapshotMapping(MutableMapping[K, V]):
+    """A mapping read lazily from a snapshot table.
+
+    Values are built by the load function on first access and then kept, so
+    changes to them persist. Keys added or removed after loading are held in
+    memory on top of the snapshot, which itself is never modified.
+
+    Keys that are not strings are stored as text, converted by the encode and
+    decode functions.
+    """
+
+    def __init__(
+        self,
+        table: _Table,
+        load: Callable[[int], V],
+        encode: Callable[[K], str] = lambda key: key,  # type: ignore
+        decode: Callable[[str], K] = lambda text: text,  # type: ignore
+    ) -> None:
+        self._table = table
+        self._load = load
+        self._encode = encode
+        self._decode = decode
+        self._cache: Dict[K, V] = {}
+        self._added: Dict[K, None] = {}
+        self._removed: Dict[K, None] = {}
+
+    def __getitem__(self, key: K) -> V:
+        if (value := self._cache.get(key)) is not None or key in self._cache:
+            return value  # type: ignore
+        if key in self._removed or (position := self._find(key)) is None:
+            raise KeyError(key)
+        value = self._cache[key] = self._load(position)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if key not in self:
+            if self._find(key) is None:
+                self._added[key] = None
+            else:
+                del self._removed[key]
+        self._cache[key] = value
+
+    def __delitem__(self, key: K) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._cache.pop(key, None)
+        if key in self._added:
+            del self._added[key]
+        else:
+            self._removed[key] = None
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._cache:
+            return True
+        if key in self._removed:
+            return False
+        try:
+            return self._find(key) is not None  # type: ignore
+        except (AttributeError, TypeError):
+            return False
+
+    def __iter__(self) -> Iterator[K]:
+        for text in self._table.keys():
+            key = self._decode(text)
+            if key not in self._removed:
+                yield key
+        yield from self._added
+
+    def __len__(self) -> int:
+        return len(self._table) - len(self._removed) + len(self._added)
+
+    def _find(self, key: K) -> Optional[int]:
+        """Finds the position of a key in the snapshot table."""
+        return self._table.find(self._encode(key))
+
+
+class _StringTable:
+    """Collects unique strings while a snapshot is being written."""
+
+    def __init__(self) -> None:
+        self._indices: Dict[str, int] = {}
+        self.offsets = array("Q", [0])
+        self._data = bytearray()
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self._data)
+
+    def index(self, text: Optional[str]) -> int:
+        """Returns the index of a string, adding it if it is new."""
+        if text is None:
+            return NONE
+        if (index := self._indices.get(text)) is None:
+            index = self._indices[text] = len(self._indices)
+            self._data += text.encode("utf-8")
+            self.offsets.append(len(self._data))
+        return index
+
+
+def _build_table(
+    strings: _StringTable,
+    items: Iterable[Tuple[str, V]],
+    to_values: Callable[[V], Sequence[Optional[str]]],
+) -> Tuple[array, array, array, array]:
+    """Builds the four arrays of a lookup table."""
+    keys, offsets, values = array("I"), array("I", [0]), array("I")
+    names: List[str] = []
+    for key, value in items:
+        names.append(key)
+        keys.append(strings.index(key))
+        values.extend(strings.index(text) for text in to_values(value))
+        offsets.append(len(values))
+    order = array("I", sorted(range(len(names)), key=names.__getitem__))
+    return keys, order, offsets, values
+
+
+def _partner(couple: Couple, identifier: str) -> str:
+    """The identifier of the other person in a couple."""
+    left, right = couple.key
+    return right if left == identifier else left
+
+
+def _decode_couple_key(text: str) -> Tuple[str, str]:
+    """Splits a couples table key back into the Couple.key it was made from."""
+    first, second = text.split(_KEY_SEPARATOR)
+    return first, second
+
+
+def _couple_key(first: str, second: str) -> Tuple[str, str]:
+    """The Couple.key of the couple made of the two identifiers."""
+    return (first, second) if first <= second else (second, first)
+
+
+def _person_values(person: Person) -> List[Optional[str]]:
+    """Flattens a person into the values stored in the members table."""
+    return [
+        person.name,
+        date_text(person.dob),
+        date_text(person.dod),
+        person.birth_place,
+        str(len(person.parents)),
+        *person.parents,
+        *person.spouses,
+    ]
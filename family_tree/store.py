@@ -0,0 +1,411 @@
+"""This module contains the SQLite-backed family store for very large families.
+
+People, parents, spouses and couples are kept in tables of a local SQLite file
+and read back on demand, so memory use does not grow with the family. Ancestor
+and relationship queries run inside SQLite as recursive common table expressions.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from family_tree import Couple, Person, gedcom
+from family_tree.dates import date_text
+from family_tree.family import _read_jsonl, _validate_json, lineal_name, relation_name
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    position INTEGER PRIMARY KEY,
+    identifier TEXT NOT NULL UNIQUE,
+    name TEXT,
+    dob TEXT,
+    dod TEXT,
+    birth_place TEXT
+);
+CREATE TABLE IF NOT EXISTS parents (
+    child TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    parent TEXT NOT NULL,
+    PRIMARY KEY (child, position)
+);
+CREATE INDEX IF NOT EXISTS parents_parent ON parents (parent);
+CREATE TABLE IF NOT EXISTS spouses (
+    person TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    spouse TEXT NOT NULL,
+    PRIMARY KEY (person, position)
+);
+CREATE INDEX IF NOT EXISTS spouses_spouse ON spouses (spouse);
+CREATE TABLE IF NOT EXISTS couples (
+    first TEXT NOT NULL,
+    second TEXT NOT NULL,
+    left TEXT NOT NULL,
+    right TEXT NOT NULL,
+    PRIMARY KEY (first, second)
+);
+CREATE INDEX IF NOT EXISTS couples_second ON couples (second);
+"""
+
+# Ancestors of :{side} with the generation they are found at, parents being 0.
+# UNION drops repeated rows, so a shared ancestor is only followed once per
+# generation, and :limit stops a parent cycle from recursing forever.
+_LINE = """
+{side}_line(identifier, generation) AS (
+    SELECT parent, 0 FROM parents WHERE child = :{side}
+    UNION
+    SELECT parents.parent, {side}_line.generation + 1
+    FROM parents JOIN {side}_line ON parents.child = {side}_line.identifier
+    WHERE {side}_line.generation < :limit
+)
+"""
+_LINES = (
+    "WITH RECURSIVE" + _LINE.format(side="first") + "," + _LINE.format(side="second")
+)
+
+
+class SQLiteFamily:
+    """A family stored in a SQLite file rather than in memory.
+
+    Behaves like Family for looking people up and adding them, and answers
+    ancestor and relationship queries with the same results, but only the
+    people being looked at are ever held in memory.
+
+    Example:
+        family = SQLiteFamily.from_jsonl("family.jsonl", "family.db")
+        family.relationship("JD1993", "JJ1996")
+    """
+
+    def __init__(self, database: str) -> None:
+        """Opens, or creates, a family database.
+
+        Args:
+            database: Location of the SQLite file.
+        """
+        self._connection = sqlite3.connect(database)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        self._size = int(self._one("SELECT COUNT(*) FROM people"))  # type: ignore
+
+    def __enter__(self) -> SQLiteFamily:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM people WHERE identifier = ?", (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def __getitem__(self, key: str) -> Person:
+        row = self._connection.execute(
+            "SELECT name, dob, dod, birth_place FROM people WHERE identifier = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        name, dob, dod, birth_place = row
+        parents = self._column(
+            "SELECT parent FROM parents WHERE child = ? ORDER BY position", key
+        )
+        spouses = self._column(
+            "SELECT spouse FROM spouses WHERE person = ? ORDER BY position", key
+        )
+        return Person(key, name, dob, dod, parents, spouses, birth_place)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def keys(self) -> Iterator[str]:
+        """Iterates over the identifiers, in the order they were added."""
+        cursor = self._connection.execute(
+            "SELECT identifier FROM people ORDER BY position"
+        )
+        return (identifier for (identifier,) in cursor)
+
+    def items(self) -> Iterator[Tuple[str, Person]]:
+        """Iterates over the identifiers and people, in the order they were added."""
+        return ((identifier, self[identifier]) for identifier in self.keys())
+
+    def values(self) -> Iterator[Person]:
+        """Iterates over the people, in the order they were added."""
+        return (self[identifier] for identifier in self.keys())
+
+    @property
+    def couples(self) -> Mapping[Tuple[str, str], Couple]:
+        """Read-only view of the couples, keyed the same way as Family.couples."""
+        return _CouplesView(self)
+
+    def couples_of(self, person: Person) -> List[Couple]:
+        """Lists the couples the given person is part of.
+
+        Args:
+            person: Person to list the couples for.
+
+        Returns:
+            List of couples, in the order they were formed.
+        """
+        rows = self._connection.execute(
+            "SELECT left, right FROM couples "
+            "WHERE first = :person OR second = :person ORDER BY rowid",
+            {"person": person.identifier},
+        ).fetchall()
+        return [Couple(self[left], self[right]) for left, right in rows]
+
+    def add_person(self, new_person: Person) -> None:
+        """Adds a new person to the family. Also checks if they are in a couple.
+
+        Args:
+            new_person (Person): Person to be added to the family.
+        """
+        self.add_people([new_person])
+
+    def add_people(self, new_people: Iterable[Person]) -> None:
+        """Adds several people to the family in a single transaction.
+
+        Equivalent to calling add_person on each person in turn.
+
+        Args:
+            new_people (Iterable[Person]): People to be added to the family.
+        """
+        try:
+            with self._connection:
+                for new_person in new_people:
+                    if new_person.identifier not in self:
+                        self._insert(new_person)
+        except BaseException:
+            # The transaction was rolled back, so recount the people
+            self._size = int(self._one("SELECT COUNT(*) FROM people"))  # type: ignore
+            raise
+
+    def _insert(self, new_person: Person) -> None:
+        """Helper function for adding a person not yet in the family."""
+        identifier = new_person.identifier
+        execute = self._connection.execute
+        # Like Family, a couple is formed when someone listing the new person as a
+        # spouse is already a member
+        for (spouse,) in execute(
+            "SELECT person FROM spouses WHERE spouse = ?", (identifier,)
+        ).fetchall():
+            first, second = sorted([spouse, identifier])
+            execute(
+                "INSERT OR REPLACE INTO couples VALUES (?, ?, ?, ?)",
+                (first, second, spouse, identifier),
+            )
+
+        execute(
+            "INSERT INTO people (identifier, name, dob, dod, birth_place) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                identifier,
+                new_person.name,
+                date_text(new_person.dob),
+                date_text(new_person.dod),
+                new_person.birth_place,
+            ),
+        )
+        self._connection.executemany(
+            "INSERT INTO parents VALUES (?, ?, ?)",
+            [(identifier, i, parent) for i, parent in enumerate(new_person.parents)],
+        )
+        self._connection.executemany(
+            "INSERT INTO spouses VALUES (?, ?, ?)",
+            [(identifier, i, spouse) for i, spouse in enumerate(new_person.spouses)],
+        )
+        self._size += 1
+
+    @classmethod
+    def from_json(cls, filepath: str, database: str) -> SQLiteFamily:
+        """Creates a SQLite family from a json file, validated as in Family.
+
+        Args:
+            filepath (str): Location of the json.
+            database (str): Location of the SQLite file.
+
+        Returns:
+            SQLiteFamily: An instance of SQLiteFamily.
+        """
+        with open(filepath, encoding="utf-8") as f:
+            family_json = json.load(f)
+        _validate_json(family_json)
+        family = cls(database)
+        family.add_people(Person(**person_json) for person_json in family_json)
+        return family
+
+    @classmethod
+    def from_jsonl(cls, filepath: str, database: str) -> SQLiteFamily:
+        """Creates a SQLite family from a JSON Lines file, one line at a time.
+
+        Each record's keys and identifier are checked as it is read. Unlike
+        Family.from_jsonl, the parent counts and cycles are not checked, as that
+        would need every parent link in memory. Relationship queries stay safe on
+        a cycle, since their recursion is limited to the size of the family.
+
+        Args:
+            filepath (str): Location of the JSON Lines file.
+            database (str): Location of the SQLite file.
+
+        Returns:
+            SQLiteFamily: An instance of SQLiteFamily.
+        """
+        family = cls(database)
+        with open(filepath, encoding="utf-8") as f:
+            family.add_people(_read_jsonl(f, family))
+        return family
+
+    @classmethod
+    def from_gedcom(cls, filepath: str, database: str) -> SQLiteFamily:
+        """Creates a SQLite family from a GEDCOM file, one record at a time.
+
+        Unlike Family.from_gedcom, the parent links are not checked for cycles, as
+        that would need every parent link in memory.
+
+        Args:
+            filepath (str): Location of the GEDCOM file.
+            database (str): Location of the SQLite file.
+
+        Returns:
+            SQLiteFamily: An instance of SQLiteFamily.
+        """
+        family = cls(database)
+        family.add_people(gedcom.read_gedcom(filepath))
+        return family
+
+    def parents(self, person: Person) -> List[Person]:
+        """Lists the parents of the given person that are in the family."""
+        return [
+            self[parent]
+            for parent in self._column(
+                "SELECT parent FROM parents JOIN people ON parent = identifier "
+                "WHERE child = ? ORDER BY parents.position",
+                person.identifier,
+            )
+        ]
+
+    def children(self, person: Person) -> List[Person]:
+        """Lists the children of the given person that are in the family."""
+        return [
+            self[child]
+            for child in self._column(
+                "SELECT child FROM parents JOIN people ON child = identifier "
+                "WHERE parent = ? ORDER BY people.position",
+                person.identifier,
+            )
+        ]
+
+    def list_ancestors(self, person: Person) -> List[Set[str]]:
+        """List the ancestors of the given person.
+
+        Args:
+            person: Person to list the ancestors for.
+
+        Returns:
+            List of sets where each set is a generation. First set are the parents etc.
+        """
+        generations: List[Set[str]] = []
+        cursor = self._connection.execute(
+            "WITH RECURSIVE"
+            + _LINE.format(side="first")
+            + "SELECT identifier, generation FROM first_line ORDER BY generation",
+            {"first": person.identifier, "limit": self._size},
+        )
+        for identifier, generation in cursor:
+            if generation == len(generations):
+                generations.append(set())
+            generations[generation].add(identifier)
+        return generations
+
+    def relationship(self, first_id: str, second_id: str) -> str:
+        """Computes whether the two given identifiers are related by blood.
+        If they are related by blood, returns the specific relationship.
+
+        Args:
+            first_id
+            second_id
+
+        Returns:
+            How second_id is related to first_id.
+        """
+        for identifier in (first_id, second_id):
+            if identifier not in self:
+                raise KeyError(identifier)
+
+        for ancestor, descendant, relation in [
+            ("second", "first", "Parent"),
+            ("first", "second", "Child"),
+        ]:
+            generation = self._lines_query(
+                f"SELECT MIN(generation) FROM {descendant}_line "
+                f"WHERE identifier = :{ancestor}",
+                first_id,
+                second_id,
+            )
+            if generation is not None:
+                return lineal_name(generation, relation)
+
+        common = self._connection.execute(
+            _LINES + "SELECT first_line.generation, second_line.generation "
+            "FROM first_line JOIN second_line USING (identifier) "
+            "ORDER BY first_line.generation, second_line.generation LIMIT 1",
+            self._line_parameters(first_id, second_id),
+        ).fetchone()
+        if common is not None:
+            return relation_name(*common)
+
+        return "Not related by blood"
+
+    def _lines_query(self, query: str, first_id: str, second_id: str) -> Optional[int]:
+        """Runs a query over both people's lines, returning a single value."""
+        row = self._connection.execute(
+            _LINES + query, self._line_parameters(first_id, second_id)
+        ).fetchone()
+        return row[0]
+
+    def _line_parameters(self, first_id: str, second_id: str) -> Dict[str, object]:
+        """Parameters for the queries over both people's lines."""
+        return {"first": first_id, "second": second_id, "limit": self._size}
+
+    def _one(self, query: str, *parameters: object) -> Optional[object]:
+        """Runs a query returning a single value."""
+        return self._connection.execute(query, parameters).fetchone()[0]
+
+    def _column(self, query: str, *parameters: object) -> List[str]:
+        """Runs a query returning a single column."""
+        return [row[0] for row in self._connection.execute(query, parameters)]
+
+
+class _CouplesView(Mapping[Tuple[str, str], Couple]):
+    """The couples of a SQLiteFamily, read from the database on each access."""
+
+    def __init__(self, family: SQLiteFamily) -> None:
+        self._family = family
+
+    def __getitem__(self, key: Tuple[str, str]) -> Couple:
+        row = None
+        if isinstance(key, tuple) and len(key) == 2:
+            row = self._family._connection.execute(
+                "SELECT left, right FROM couples WHERE first = ? AND second = ?", key
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return Couple(self._family[row[0]], self._family[row[1]])
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        cursor = self._family._connection.execute(
+            "SELECT first, second FROM couples ORDER BY rowid"
+        )
+        return (tuple(key) for key in cursor)  # type: ignore
+
+    def __len__(self) -> int:
+        return self._family._one("SELECT COUNT(*) FROM couples")  # type: ignore
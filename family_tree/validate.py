@@ -0,0 +1,153 @@
+"""This module contains the integrity checks run on family records before loading."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence
+
+MAX_PARENTS = 2
+# Problems beyond this are counted in the error message but not listed
+_MESSAGE_LIMIT = 20
+
+
+class Problem(NamedTuple):
+    """One problem found in the records.
+
+    Attributes:
+        identifier: Identifier of the record with the problem.
+        kind: Short name of the check that failed, e.g. "cycle".
+        detail: Human readable description.
+    """
+
+    identifier: str
+    kind: str
+    detail: str
+
+
+class ValidationError(ValueError):
+    """Raised when family records fail their integrity checks.
+
+    Attributes:
+        problems: Every problem found, in the order the records were read.
+    """
+
+    def __init__(self, problems: Sequence[Problem]) -> None:
+        self.problems = list(problems)
+        lines = [f"{len(self.problems)} problem(s) found in the family records:"]
+        lines.extend(
+            f"  {problem.identifier}: {problem.detail}"
+            for problem in self.problems[:_MESSAGE_LIMIT]
+        )
+        if len(self.problems) > _MESSAGE_LIMIT:
+            lines.append(f"  ... and {len(self.problems) - _MESSAGE_LIMIT} more")
+        super().__init__("\n".join(lines))
+
+
+def check_records(records: Sequence[Mapping[str, Any]], strict: bool = False) -> None:
+    """Checks the links between records in time linear in their size.
+
+    Null parents or spouses are treated as empty, as Person does. A person may
+    have at most two parents and may not be their own ancestor,
+    which is checked with Kahn's topological sort. In strict mode every parent
+    and spouse must also be one of the records, and spouses must list each other.
+
+    Args:
+        records: Records in the json input format, with unique identifiers.
+        strict: Whether to also check parent and spouse references.
+
+    Raises:
+        ValidationError: Listing every problem found.
+    """
+    by_id = {record["identifier"]: record for record in records}
+    problems: List[Problem] = []
+
+    for identifier, record in by_id.items():
+        parents = list(dict.fromkeys(record["parents"] or []))
+        problems.extend(_parent_count_problems(identifier, parents))
+        if not strict:
+            continue
+        for parent in parents:
+            if parent not in by_id:
+                problems.append(
+                    Problem(
+                        identifier, "missing_parent", f"parent {parent} is missing."
+                    )
+                )
+        for spouse in record["spouses"] or []:
+            if spouse not in by_id:
+                problems.append(
+                    Problem(
+                        identifier, "missing_spouse", f"spouse {spouse} is missing."
+                    )
+                )
+            elif identifier not in (by_id[spouse]["spouses"] or []):
+                problems.append(
+                    Problem(
+                        identifier,
+                        "unreciprocated_spouse",
+                        f"spouse {spouse} does not list them as a spouse.",
+                    )
+                )
+
+    problems.extend(
+        _cycle_problems(
+            {
+                identifier: record["parents"] or []
+                for identifier, record in by_id.items()
+            }
+        )
+    )
+    if problems:
+        raise ValidationError(problems)
+
+
+def check_lineage(parents_of: Mapping[str, Sequence[str]]) -> None:
+    """Runs the parent count and cycle checks of check_records on a built family.
+
+    Streaming loaders never hold all the records at once, so they check the
+    lineage they have built instead.
+
+    Args:
+        parents_of: Each member's identifier mapped to their parents' identifiers.
+
+    Raises:
+        ValidationError: Listing every problem found.
+    """
+    problems = [
+        problem
+        for identifier, parents in parents_of.items()
+        for problem in _parent_count_problems(identifier, list(dict.fromkeys(parents)))
+    ]
+    problems.extend(_cycle_problems(parents_of))
+    if problems:
+        raise ValidationError(problems)
+
+
+def _parent_count_problems(identifier: str, parents: Sequence[str]) -> List[Problem]:
+    """Checks a person has no more than MAX_PARENTS distinct parents."""
+    if len(parents) > MAX_PARENTS:
+        return [Problem(identifier, "parents", f"has {len(parents)} parents listed.")]
+    return []
+
+
+def _cycle_problems(parents_of: Mapping[str, Sequence[str]]) -> List[Problem]:
+    """Finds everyone in or descended from a parent cycle with Kahn's algorithm."""
+    children: Dict[str, List[str]] = {}
+    waiting: Dict[str, int] = {}
+    for identifier, parents in parents_of.items():
+        known = [parent for parent in dict.fromkeys(parents) if parent in parents_of]
+        waiting[identifier] = len(known)
+        for parent in known:
+            children.setdefault(parent, []).append(identifier)
+
+    # Anyone never reached had a parent stuck in, or descended from, a cycle
+    ready = deque(identifier for identifier, count in waiting.items() if not count)
+    while ready:
+        for child in children.get(ready.popleft(), ()):
+            waiting[child] -= 1
+            if not waiting[child]:
+                ready.append(child)
+    return [
+        Problem(identifier, "cycle", "is their own ancestor or descends from a cycle.")
+        for identifier, count in waiting.items()
+        if count
+    ]
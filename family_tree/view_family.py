@@ -1,7 +1,29 @@
 """This module contains the class used to build and view the family graph."""
-from graphviz import Graph  # type: ignore
+import os
+import subprocess
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
 
-from family_tree import Family, Person, Couple
+import graphviz  # type: ignore
+from graphviz import Graph, Source  # type: ignore
+
+from family_tree import Family, Person, Couple, instrument
+
+if TYPE_CHECKING:
+    from family_tree.render import RenderCache
+
+# People are keyed by identifier and couples by Couple.key
+StatementKey = Union[str, Tuple[str, str]]
 
 
 class FamilyGraph:
@@ -10,6 +32,11 @@ class FamilyGraph:
     Attributes:
         family (Family): Instance of the Family class.
         graph (Graph): Instance of the Graph class from graphviz.
+        focus (str): Identifier of the person a focused graph is centred on.
+
+    Note:
+        Rendered labels and DOT statements are cached against each person's
+        content hash, so refresh only regenerates people who have changed.
     """
 
     _dummy_node_attrs = {
@@ -20,16 +47,23 @@ class FamilyGraph:
         "margin": "0",
     }
 
-    def __init__(self, family: Family, layout: str) -> None:
+    def __init__(
+        self, family: Family, layout: str, name: str = "My Family", link: bool = True
+    ) -> None:
         """Initialises the FamilyGraph object.
 
         Args:
             family: The family to be viewed.
             layout: The graphviz layout option.
+            name: Name of the graph, also used for the output file names.
+            link: Whether to build the whole graph in memory. Pass False for very
+                large families that will only be streamed with write_source or
+                render_stream.
         """
         self.family = family
+        self.layout = layout
         self.graph = Graph(  # type: ignore
-            name="My Family",
+            name=name,
             graph_attr={
                 "layout": layout,
                 "concentrate": "true",
@@ -37,27 +71,312 @@ class FamilyGraph:
             },
             strict=True,
         )
-        self._link_family()
+        self._labels: Dict[str, Tuple[int, str]] = {}
+        self._statements: Dict[StatementKey, Tuple[Tuple[int, ...], List[str]]] = {}
+        self._linked = False
+        self.focus: Optional[str] = None
+        if link:
+            self._link_family()
+
+    @classmethod
+    def focused(
+        cls,
+        family: Family,
+        identifier: str,
+        layout: str,
+        ancestors: int = 2,
+        descendants: int = 2,
+        spouses: int = 1,
+        name: str = "My Family",
+    ) -> "FamilyGraph":
+        """Creates a graph of only the people around one person.
+
+        The neighbourhood is found from the family's indexes, so building and
+        rendering the graph takes time in proportion to the window shown rather
+        than the whole family. Parents outside the window are left out.
+
+        Args:
+            family: The family to take the people from.
+            identifier: Unique identifier of the person at the centre.
+            layout: The graphviz layout option.
+            ancestors: Number of generations of ancestors to show.
+            descendants: Number of generations of descendants to show.
+            spouses: Number of marriages to follow out from everyone shown.
+            name: Name of the graph, also used for the output file names.
+
+        Returns:
+            The focused graph.
+        """
+        window = family.neighbourhood(identifier, ancestors, descendants, spouses)
+        family_graph = cls(window, layout, name, link=False)
+        family_graph.focus = identifier
+        family_graph._link_family()
+        return family_graph
 
     def render_family(self) -> None:
-        """Produces My Family.gv and My Family.gv.pdf files."""
-        self.graph.render(view=True)  # type: ignore
+        """Produces My Family.gv and My Family.gv.pdf files.
 
-    def _link_family(self) -> None:
-        """Creates the linkages between each member of the family."""
+        If both files already exist and the graph has not changed, the existing
+        pdf is opened without running the layout again.
+        """
+        with instrument.phase("render_family", len(self.family)):
+            if not self._linked:
+                self._link_family()
+
+            output = f"{self.graph.filepath}.pdf"  # type: ignore
+            if self._is_rendered(output):
+                graphviz.view(output)  # type: ignore
+            else:
+                with instrument.phase("graphviz"):
+                    self.graph.render(view=True)  # type: ignore
+
+    def render_to(
+        self,
+        path: str,
+        format: str = "pdf",
+        cache: Optional["RenderCache"] = None,
+    ) -> str:
+        """Renders the graph to a file without opening a viewer.
+
+        Suitable for servers. With a cache, a graph whose DOT source has been
+        rendered before is copied from the cache instead of running graphviz.
+
+        Args:
+            path: Path of the file to produce.
+            format: The graphviz output format, e.g. "pdf" or "svg".
+            cache: Cache to serve the output from, or store it in if missing.
+
+        Returns:
+            The path of the rendered file.
+        """
+        from family_tree import render
+
+        with instrument.phase("render_to", len(self.family)):
+            source = self.source
+            with instrument.phase("graphviz"):
+                data = render.render_source(source, self.layout, format, cache)
+            return render.write_output(path, data)
+
+    @property
+    def source(self) -> str:
+        """The DOT source of the graph."""
+        if self._linked:
+            return self.graph.source  # type: ignore
+        return "".join(self.iter_source())
+
+    def refresh(self) -> None:
+        """Regenerates the graph after the family has been edited.
+
+        Only people whose details have changed, and their couples, are rendered
+        again. Everything else is reused from the cache.
+        """
+        self.graph.clear(keep_attrs=True)  # type: ignore
+        self._link_family()
+
+    def iter_source(self) -> Iterator[str]:
+        """Yields the DOT source of the graph line by line.
+
+        If the graph was not linked in memory, each person's statements are built
+        as they are yielded and then discarded, so memory use stays the same
+        however large the family is.
+        """
+        if self._linked:
+            yield from self.graph  # type: ignore
+            return
+
+        # With an empty body the graph only yields its head, attributes and tail
+        *head, tail = self.graph  # type: ignore
+        yield from head
+        body: List[str] = self.graph.body  # type: ignore
         for couple in self.family.couples.values():
             self._couple_connection(couple)
-
+            yield from body
+            body.clear()
         for person in self.family.values():
-            self._person_node(person)
-            if person.parents:
-                self._link_parents(person)
+            self._person_statements(person)
+            yield from body
+            body.clear()
+        yield tail
+
+    def write_source(self, out: TextIO) -> None:
+        """Writes the DOT source to an open file or pipe as it is generated.
+
+        Args:
+            out: Text stream to write to.
+        """
+        for line in self.iter_source():
+            out.write(line)
+
+    def render_stream(self, outfile: str, format: str = "pdf") -> str:
+        """Renders the graph by streaming its source into a graphviz process.
+
+        The source is never held in memory or written to disk in full.
+
+        Args:
+            outfile: Path of the file to produce.
+            format: The graphviz output format, e.g. "pdf" or "svg".
+
+        Returns:
+            The path of the rendered file.
+
+        Raises:
+            subprocess.CalledProcessError: If graphviz fails.
+        """
+        command = [self.layout, f"-T{format}", "-o", outfile]
+        with instrument.phase("render_stream", len(self.family)):
+            with subprocess.Popen(
+                command, stdin=subprocess.PIPE, encoding="utf-8"
+            ) as process:
+                self.write_source(process.stdin)  # type: ignore
+                process.stdin.close()  # type: ignore
+                if process.wait():
+                    raise subprocess.CalledProcessError(process.returncode, command)
+        return outfile
+
+    def _is_rendered(self, output: str) -> bool:
+        """Checks whether the saved source and output match the current graph."""
+        if not os.path.exists(output):
+            return False
+        try:
+            with open(self.graph.filepath, encoding="utf-8") as f:  # type: ignore
+                return f.read() == self.graph.source  # type: ignore
+        except FileNotFoundError:
+            return False
+
+    def component_graphs(self) -> List["FamilyGraph"]:
+        """Creates a separate graph for each unrelated part of the family."""
+        return [
+            FamilyGraph(
+                self.family.subfamily(component),
+                self.layout,
+                f"{self.graph.name} {index}",  # type: ignore
+            )
+            for index, component in enumerate(self.family.components(), 1)
+        ]
+
+    def render_components(
+        self,
+        directory: str = ".",
+        format: str = "pdf",
+        pack: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[str]:
+        """Lays out each unrelated part of the family in its own graphviz process.
+
+        The processes run in parallel, so large archives of separate lineages use
+        every core rather than one very large layout.
+
+        Args:
+            directory: Folder to write the files to.
+            format: The graphviz output format, e.g. "pdf" or "svg".
+            pack: Whether to combine the laid out parts into one file with gvpack.
+            max_workers: Maximum number of processes. Defaults to the CPU count.
+
+        Returns:
+            Paths of the rendered files, or of the single packed file.
+        """
+        # Imported here, as process pools are slow to import
+        from concurrent.futures import ProcessPoolExecutor
+
+        with instrument.phase("render_components", len(self.family)):
+            with instrument.phase("split") as record:
+                graphs = self.component_graphs()
+                if record:
+                    record.count = len(graphs)
+
+            with instrument.phase("graphviz", len(graphs)):
+                with ProcessPoolExecutor(max_workers) as executor:
+                    paths = list(
+                        executor.map(
+                            _render_source,
+                            [graph.graph.source for graph in graphs],  # type: ignore
+                            [graph.graph.name for graph in graphs],  # type: ignore
+                            [directory] * len(graphs),
+                            ["dot" if pack else format] * len(graphs),
+                            [self.layout] * len(graphs),
+                        )
+                    )
+
+                if pack:
+                    name = self.graph.name  # type: ignore
+                    paths = [_pack(paths, directory, name, format)]
+
+        return paths
+
+    def _link_family(self) -> None:
+        """Creates the linkages between each member of the family."""
+        with instrument.phase("link_family", len(self.family)):
+            self._linked = True
+            # Entries for people and couples no longer in the family are dropped
+            statements, self._statements = self._statements, {}
+
+            for couple in self.family.couples.values():
+                self._add_statements(
+                    statements,
+                    couple.key,
+                    [couple.left, couple.right],
+                    lambda: self._couple_connection(couple),
+                )
+
+            for person in self.family.values():
+                self._add_statements(
+                    statements,
+                    person.identifier,
+                    [person],
+                    lambda: self._person_statements(person),
+                )
+
+            self._labels = {
+                identifier: label
+                for identifier, label in self._labels.items()
+                if identifier in self.family.members
+            }
+
+    def _add_statements(
+        self,
+        statements: Dict[StatementKey, Tuple[Tuple[int, ...], List[str]]],
+        key: StatementKey,
+        people: List[Person],
+        build: Callable[[], None],
+    ) -> None:
+        """Adds the cached statements for key, rebuilding them if people changed."""
+        hashes = tuple(person.content_hash() for person in people)
+        cached = statements.get(key)
+        if cached is not None and cached[0] == hashes:
+            lines = cached[1]
+            self.graph.body.extend(lines)  # type: ignore
+        else:
+            start = len(self.graph.body)  # type: ignore
+            build()
+            lines = self.graph.body[start:]  # type: ignore
+        self._statements[key] = (hashes, lines)
+
+    def _person_statements(self, person: Person) -> None:
+        """Adds a person's node and the links to their parents."""
+        self._person_node(person)
+        parents = person.parents
+        if self.focus is not None:
+            parents = tuple(p for p in parents if p in self.family.members)
+        if parents:
+            self._link_parents(parents, person.identifier)
+
+    def _label(self, person: Person) -> str:
+        """Returns the person's node label, only rendering it when they change."""
+        if not self._linked:
+            return "<" + person.to_html() + ">"
+
+        content_hash = person.content_hash()
+        cached = self._labels.get(person.identifier)
+        if cached is None or cached[0] != content_hash:
+            cached = (content_hash, "<" + person.to_html() + ">")
+            self._labels[person.identifier] = cached
+        return cached[1]
 
     def _person_node(self, person: Person) -> None:
         """For adding a node containing a persons key info."""
         self.graph.node(  # type: ignore
             person.identifier,
-            label="<" + person.to_html() + ">",
+            label=self._label(person),
             shape="rectangle",
             color="black",
         )
@@ -73,7 +392,7 @@ class FamilyGraph:
             for person in [couple.left, couple.right]:
                 c.node(  # type: ignore
                     person.identifier,
-                    label="<" + person.to_html() + ">",
+                    label=self._label(person),
                     shape="rectangle",
                     color="black",
                 )
@@ -83,16 +402,36 @@ class FamilyGraph:
         """Adds an edge between two blood relatives."""
         self.graph.edge(tail, head)  # type: ignore
 
-    def _link_parents(self, person: Person) -> None:
+    def _link_parents(self, parents: Sequence[str], identifier: str) -> None:
         """Links parents to their children via a dummy node."""
-        if len(person.parents) == 1:
+        if len(parents) == 1:
             # & is arbitrary, used to make dummy node ID different to person node
-            comb_id = f"{person.parents[0]}&"
+            comb_id = f"{parents[0]}&"
         else:
-            comb_id = "".join(sorted(person.parents))
+            comb_id = "".join(sorted(parents))
 
-        for parent in person.parents:
+        for parent in parents:
             self._relative_edge(parent, comb_id)
 
         self._dummy_node(comb_id)
-        self._relative_edge(comb_id, person.identifier)
+        self._relative_edge(comb_id, identifier)
+
+
+def _render_source(
+    source: str, name: str, directory: str, format: str, layout: str
+) -> str:
+    """Renders DOT source in a worker process, returning the output path."""
+    graph = Source(source, filename=f"{name}.gv", directory=directory, engine=layout)
+    return graph.render(format=format, cleanup=True)  # type: ignore
+
+
+def _pack(paths: List[str], directory: str, name: str, format: str) -> str:
+    """Packs laid out graphs into one file with gvpack, removing the parts."""
+    packed = subprocess.run(
+        ["gvpack", *paths], capture_output=True, check=True, text=True
+    ).stdout
+    for path in paths:
+        os.remove(path)
+
+    graph = Source(packed, filename=f"{name}.gv", directory=directory, engine="neato")
+    return graph.render(format=format, neato_no_op=2, cleanup=True)  # type: ignore
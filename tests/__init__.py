@@ -1 +1,9 @@
+import importlib.util
+
+import pytest  # type: ignore
+
 LOCATION = "tests/data/"
+
+needs_numpy = pytest.mark.skipif(  # type: ignore
+    importlib.util.find_spec("numpy") is None, reason="numpy is not installed"
+)
@@ -53,6 +53,15 @@ def test_couple_string(example_couple: family_tree.Couple):
     assert isinstance(str(example_couple), str)
 
 
+def test_couple_key(john_doe: family_tree.Person, jane_doe: family_tree.Person):
+    assert family_tree.Couple(john_doe, jane_doe).key == ("JD1990", "JD1992")
+    assert family_tree.Couple(jane_doe, john_doe).key == ("JD1990", "JD1992")
+
+
+def test_hash_is_key_hash(example_couple: family_tree.Couple):
+    assert hash(example_couple) == hash(example_couple.key)
+
+
 def test_contains_true(
     example_couple: family_tree.Couple, john_doe: family_tree.Person
 ):
@@ -117,3 +126,7 @@ def test_failed_to_return(
     example_couple: family_tree.Couple, emily_doe: family_tree.Person
 ):
     assert example_couple.return_other(emily_doe) is None
+
+
+def test_compact_storage(example_couple: family_tree.Couple):
+    assert not hasattr(example_couple, "__dict__")
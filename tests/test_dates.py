@@ -0,0 +1,57 @@
+from datetime import date, datetime
+
+import pytest  # type: ignore
+
+from family_tree import PartialDate
+from family_tree.dates import format_date, parse_date
+
+
+def test_full_date():
+    assert parse_date("1993-10-19") == date(1993, 10, 19)
+
+
+def test_datetime_unchanged():
+    value = datetime(1990, 1, 1, 12, 30)
+    assert parse_date(value) is value
+
+
+def test_none_and_empty():
+    assert parse_date(None) is None
+    assert parse_date("  ") is None
+
+
+def test_year_only():
+    assert parse_date("1890") == PartialDate(1890)
+
+
+def test_year_month():
+    assert parse_date("1890-5") == PartialDate(1890, 5)
+
+
+def test_circa():
+    assert parse_date("c. 1890") == PartialDate(1890, circa=True)
+    assert parse_date("circa 1890-05-01") == PartialDate(1890, 5, 1, True)
+
+
+def test_iso_datetime():
+    assert parse_date("1990-01-01T10:00") == datetime(1990, 1, 1, 10)
+
+
+def test_invalid_day():
+    with pytest.raises(ValueError):  # type: ignore
+        parse_date("1990-02-30")
+
+
+def test_invalid_month():
+    with pytest.raises(ValueError):  # type: ignore
+        parse_date("1990-13")
+
+
+def test_format_date():
+    assert format_date(datetime(1990, 1, 1, 12)) == "1990-01-01"
+    assert format_date(PartialDate(1890, 5, circa=True)) == "c. 1890-05"
+
+
+def test_partial_round_trip():
+    for text in ["1890", "1890-05", "c. 1890-05-01"]:
+        assert str(parse_date(text)) == text
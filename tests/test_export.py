@@ -0,0 +1,49 @@
+import csv
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest  # type: ignore
+
+import family_tree
+from family_tree import export
+from . import LOCATION
+
+
+@pytest.fixture
+def relation_test_fam() -> family_tree.Family:
+    return family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+
+
+def test_export_relationships(relation_test_fam: family_tree.Family, tmp_path: Path):
+    path = tmp_path / "relationships.csv"
+    progress: List[Tuple[int, int]] = []
+    written = relation_test_fam.export_relationships(
+        str(path), chunk_size=3, max_workers=2, progress=lambda *p: progress.append(p)
+    )
+    assert written == 90
+    assert progress[-1] == (90, 90)
+    assert len(progress) == 4
+
+    with open(path, newline="", encoding="utf-8") as f:
+        header, *rows = list(csv.reader(f))
+    assert header == export.HEADER
+    assert len(rows) == 90
+    for first, second, relationship in rows:
+        assert relationship == relation_test_fam.relationship(first, second)
+
+
+def test_export_lineage(tmp_path: Path):
+    family = family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+    family.add_people(
+        family_tree.Family.from_json(f"{LOCATION}test_family.json").values()
+    )
+    path = tmp_path / "relationships.tsv"
+    lineage = family.components()[1]
+    assert family.export_relationships(str(path), lineage, delimiter="\t") == 2
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "first_id\tsecond_id\trelationship"
+    assert sorted(lines[1:]) == [
+        "JD1993\tJJ1996\tNot related by blood",
+        "JJ1996\tJD1993\tNot related by blood",
+    ]
@@ -1,10 +1,13 @@
+import json
+import subprocess
+import sys
 from datetime import datetime
 
 import pytest  # type: ignore
 
 import family_tree
 from family_tree import constants
-from . import LOCATION
+from . import LOCATION, needs_numpy
 
 
 @pytest.fixture
@@ -38,7 +41,7 @@ def test_couple_added(my_test_fam: family_tree.Family):
 
 
 def test_couple_membership(my_test_fam: family_tree.Family):
-    couple = my_test_fam.couples["JD1993 JJ1996"]
+    couple = my_test_fam.couples[("JD1993", "JJ1996")]
     new_couple = family_tree.Couple(couple.left, couple.right)
     assert couple == new_couple
 
@@ -58,9 +61,80 @@ def test_json_validate_fail_identifier():
         family_tree.Family.from_json(f"{LOCATION}invalid_id.json")
 
 
+def test_family_from_jsonl():
+    family = family_tree.Family.from_jsonl(f"{LOCATION}test_family.jsonl")
+    assert len(family) == 2
+    assert ("JD1993", "JJ1996") in family.couples
+
+
+def test_json_validate_links():
+    with pytest.raises(family_tree.ValidationError) as error:  # type: ignore
+        family_tree.Family.from_json(f"{LOCATION}invalid_links.json")
+    assert [(p.identifier, p.kind) for p in error.value.problems] == [
+        ("C", "parents"),
+        ("A", "cycle"),
+        ("B", "cycle"),
+        ("C", "cycle"),
+        ("E", "cycle"),
+    ]
+
+
+def test_json_validate_links_strict():
+    with pytest.raises(family_tree.ValidationError) as error:  # type: ignore
+        family_tree.Family.from_json(f"{LOCATION}invalid_links.json", strict=True)
+    kinds = {p.kind for p in error.value.problems}
+    assert {"missing_parent", "unreciprocated_spouse"} <= kinds
+    with pytest.raises(family_tree.ValidationError):  # type: ignore
+        family_tree.Family.from_json(f"{LOCATION}test_family.json", strict=True)
+
+
+def test_json_null_links(tmp_path):
+    path = tmp_path / "null_links.json"
+    path.write_text(
+        json.dumps(
+            [
+                {
+                    "identifier": "AB2000",
+                    "name": "Alice Brown",
+                    "dob": None,
+                    "dod": None,
+                    "parents": None,
+                    "spouses": None,
+                    "birth_place": None,
+                }
+            ]
+        )
+    )
+    family = family_tree.Family.from_json(str(path))
+    assert family["AB2000"].parents == ()
+    assert family["AB2000"].spouses == ()
+    family_tree.Family.from_json(str(path), strict=True)
+
+
+def test_jsonl_validate_links(tmp_path):
+    with open(f"{LOCATION}invalid_links.json", encoding="utf-8") as f:
+        records = json.load(f)
+    path = tmp_path / "invalid_links.jsonl"
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    with pytest.raises(family_tree.ValidationError) as error:  # type: ignore
+        family_tree.Family.from_jsonl(str(path))
+    assert [(p.identifier, p.kind) for p in error.value.problems] == [
+        ("C", "parents"),
+        ("A", "cycle"),
+        ("B", "cycle"),
+        ("C", "cycle"),
+        ("E", "cycle"),
+    ]
+
+
+def test_jsonl_validate_fail_identifier():
+    with pytest.raises(KeyError):  # type: ignore
+        family_tree.Family.from_jsonl(f"{LOCATION}invalid_id.jsonl")
+
+
 @pytest.fixture
 def relation_test_fam() -> family_tree.Family:
-    return family_tree.Family.from_json("tests\\data\\relationship_test.json")
+    return family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
 
 
 def test_list_ancestors_layout(relation_test_fam: family_tree.Family):
@@ -71,6 +145,57 @@ def test_list_ancestors_layout(relation_test_fam: family_tree.Family):
     ]
 
 
+@needs_numpy
+def test_kinship(relation_test_fam: family_tree.Family):
+    assert relation_test_fam.kinship("G1A", "G1A") == 0.5
+    assert relation_test_fam.kinship("G1A", "G1B") == 0.25
+    assert relation_test_fam.kinship("G1A", "G2A") == 0.25
+    assert relation_test_fam.kinship("G1A", "G2C") == 0.125
+    assert relation_test_fam.kinship("G1A", "G4A") == 0.0625
+    assert relation_test_fam.kinship("G2A", "G2B") == 0
+
+
+@needs_numpy
+def test_kinship_missing_parents(my_test_fam: family_tree.Family):
+    sibling = family_tree.Person("S1", "Sibling", parents=["Bob Doe", "Wendy Smith"])
+    my_test_fam.add_person(sibling)
+    assert my_test_fam.kinship("S1", "JD1993") == 0.25
+
+
+@needs_numpy
+def test_kinship_matrix(relation_test_fam: family_tree.Family):
+    matrix = relation_test_fam.kinship_matrix(["G1A", "G2C", "G4A"])
+    assert matrix.tolist() == [
+        [0.5, 0.125, 0.0625],
+        [0.125, 0.5, 0.125],
+        [0.0625, 0.125, 0.5],
+    ]
+
+
+@needs_numpy
+def test_inbreeding(relation_test_fam: family_tree.Family):
+    child = family_tree.Person("X", "Child of Siblings", parents=["G1A", "G1B"])
+    relation_test_fam.add_person(child)
+    assert relation_test_fam.inbreeding("X") == 0.25
+    assert relation_test_fam.inbreeding("G1A") == 0
+
+
+def test_list_descendants(relation_test_fam: family_tree.Family):
+    assert list(relation_test_fam.list_descendants(relation_test_fam["G4A"])) == [
+        {"G3D"},
+        {"G2B", "G2C"},
+        {"G1A", "G1B"},
+    ]
+
+
+def test_list_descendants_lazy(relation_test_fam: family_tree.Family):
+    descendants = relation_test_fam.list_descendants(relation_test_fam["G4A"])
+    assert next(descendants) == {"G3D"}
+    limited = relation_test_fam.list_descendants(relation_test_fam["G4A"], 2)
+    assert len(list(limited)) == 2
+    assert not list(relation_test_fam.list_descendants(relation_test_fam["G1A"]))
+
+
 def test_parental(relation_test_fam: family_tree.Family):
     assert relation_test_fam.relationship("G1A", "G2A") == "Parent"
 
@@ -97,3 +222,246 @@ def test_aunt_uncle(relation_test_fam: family_tree.Family):
     assert (
         relation_test_fam.relationship("G1A", "G2C") == constants.RELATION_MATRIX[1][0]
     )
+
+
+def test_add_people(my_test_fam: family_tree.Family):
+    my_test_fam.add_people(
+        [
+            family_tree.Person("AB2000", "Alice Brown", spouses=["CB2000"]),
+            family_tree.Person("CB2000", "Carl Brown", spouses=["AB2000"]),
+            family_tree.Person("JJ1996", "Jane Jones"),
+        ]
+    )
+    assert len(my_test_fam) == 4
+    assert ("AB2000", "CB2000") in my_test_fam.couples
+
+
+def test_couple_added_when_spouse_listed_first():
+    family = family_tree.Family()
+    family.add_person(family_tree.Person("AB2000", "Alice Brown", spouses=["CB2000"]))
+    assert len(family.couples) == 0
+    family.add_person(family_tree.Person("CB2000", "Carl Brown"))
+    assert len(family.couples) == 1
+
+
+def test_couples_of(relation_test_fam: family_tree.Family):
+    couples = relation_test_fam.couples_of(relation_test_fam["G3B"])
+    assert couples == [relation_test_fam.couples[("G3A", "G3B")]]
+    assert relation_test_fam.couples_of(relation_test_fam["G1A"]) == []
+
+
+def test_couples_of_second_spouse():
+    family = family_tree.Family()
+    family.add_person(
+        family_tree.Person("AB2000", "Alice Brown", spouses=["CB2000", "DB2000"])
+    )
+    family.add_person(family_tree.Person("CB2000", "Carl Brown"))
+    family.add_person(family_tree.Person("DB2000", "Dan Brown"))
+    partners = [
+        couple.return_other(family["AB2000"])
+        for couple in family.couples_of(family["AB2000"])
+    ]
+    assert partners == [family["CB2000"], family["DB2000"]]
+    assert len(family.couples_of(family["DB2000"])) == 1
+
+
+def test_couples_of_repeated_spouse():
+    family = family_tree.Family()
+    family.add_person(family_tree.Person("A", "Ann", spouses=["B", "B"]))
+    family.add_person(family_tree.Person("B", "Bob"))
+    assert len(family.couples_of(family["A"])) == 1
+    assert family.couples_of(family["A"])[0] is family.couples[("A", "B")]
+
+
+def test_graph_dict_links(relation_test_fam: family_tree.Family):
+    graph_dict = relation_test_fam.to_graph_dict()
+    links = graph_dict[relation_test_fam["G2A"]]
+    assert (relation_test_fam["G2B"], "spouse") in links
+    assert (relation_test_fam["G3A"], "parent") in links
+    assert (relation_test_fam["G3B"], "parent") in links
+    assert len(links) == 3
+
+
+def test_setitem_updates_indexes(relation_test_fam: family_tree.Family):
+    relation_test_fam["X"] = family_tree.Person("X", "New Person", parents=["G4A"])
+    assert relation_test_fam.children(relation_test_fam["G4A"])[-1].identifier == "X"
+    assert relation_test_fam.component_size("X") == len(relation_test_fam)
+    with pytest.raises(KeyError):
+        relation_test_fam["Y"] = family_tree.Person("X", "New Person")
+
+
+def test_setitem_replaces_member(relation_test_fam: family_tree.Family):
+    order = list(relation_test_fam)
+    relation_test_fam["G2C"] = family_tree.Person("G2C", "Replaced")
+    assert list(relation_test_fam) == order
+    assert relation_test_fam["G2C"].name == "Replaced"
+    children = relation_test_fam.children(relation_test_fam["G3C"])
+    assert children == [relation_test_fam["G2B"]]
+    assert relation_test_fam.component_size("G2C") == 1
+    assert relation_test_fam.list_ancestors(relation_test_fam["G2C"]) == []
+
+
+def test_setitem_replaces_spouse(relation_test_fam: family_tree.Family):
+    old_couple = relation_test_fam.couples[("G3A", "G3B")]
+    relation_test_fam["G3A"] = family_tree.Person("G3A", "Replaced")
+    couples = relation_test_fam.couples_of(relation_test_fam["G3B"])
+    assert couples == [relation_test_fam.couples[("G3A", "G3B")]]
+    assert couples[0] is not old_couple
+    assert couples[0].left.name == "Replaced" or couples[0].right.name == "Replaced"
+    assert len(relation_test_fam.couples) == 3
+
+
+def test_children(relation_test_fam: family_tree.Family):
+    children = relation_test_fam.children(relation_test_fam["G3C"])
+    assert set(children) == {relation_test_fam["G2B"], relation_test_fam["G2C"]}
+
+
+def test_parents_ignores_missing(my_test_fam: family_tree.Family):
+    assert my_test_fam.parents(my_test_fam["JD1993"]) == []
+    assert my_test_fam.parents_of["JD1993"] == ("Bob Doe", "Wendy Smith")
+
+
+def test_ancestors_with_missing_parents(my_test_fam: family_tree.Family):
+    assert my_test_fam.list_ancestors(my_test_fam["JD1993"]) == [
+        {"Bob Doe", "Wendy Smith"}
+    ]
+
+
+def test_ancestors_updated_when_parent_added(my_test_fam: family_tree.Family):
+    my_test_fam.list_ancestors(my_test_fam["JD1993"])
+    my_test_fam.add_person(family_tree.Person("Bob Doe", "Bob Doe", parents=["GD"]))
+    assert my_test_fam.list_ancestors(my_test_fam["JD1993"]) == [
+        {"Bob Doe", "Wendy Smith"},
+        {"GD"},
+    ]
+
+
+def test_set_parents(relation_test_fam: family_tree.Family):
+    relation_test_fam.list_ancestors(relation_test_fam["G1A"])
+    relation_test_fam.set_parents(relation_test_fam["G2A"], [])
+    assert relation_test_fam.list_ancestors(relation_test_fam["G1A"]) == [
+        {"G2B", "G2A"},
+        {"G3C", "G3D"},
+        {"G4A"},
+    ]
+    assert "G2A" not in relation_test_fam.children_of.get("G3A", [])
+
+
+def test_deep_ancestors():
+    family = family_tree.Family()
+    family.add_people(
+        family_tree.Person(f"P{i}", f"P{i}", parents=[f"P{i + 1}"]) for i in range(2000)
+    )
+    assert len(family.list_ancestors(family["P0"])) == 2000
+
+
+def test_ancestor_cycle():
+    family = family_tree.Family()
+    family.add_person(family_tree.Person("A", "A", parents=["B"]))
+    family.add_person(family_tree.Person("B", "B", parents=["A"]))
+    with pytest.raises(ValueError):  # type: ignore
+        family.list_ancestors(family["A"])
+
+
+def test_relationships(relation_test_fam: family_tree.Family):
+    pairs = [("G1A", "G2A"), ("G1A", "G1B"), ("G2B", "G1A")]
+    assert relation_test_fam.relationships(pairs) == {
+        pair: relation_test_fam.relationship(*pair) for pair in pairs
+    }
+
+
+def test_relationships_from(relation_test_fam: family_tree.Family):
+    relations = relation_test_fam.relationships_from("G1A")
+    assert "G1A" not in relations
+    assert len(relations) == len(relation_test_fam) - 1
+    assert relations["G4A"] == "Great Grand-Parent"
+    assert relations["G2C"] == constants.RELATION_MATRIX[1][0]
+
+
+def test_relation_name_matches_matrix():
+    for index_f, row in enumerate(constants.RELATION_MATRIX):
+        for index_s, name in enumerate(row):
+            assert family_tree.family.relation_name(index_f, index_s) == name
+
+
+def test_distant_cousins():
+    family = family_tree.Family()
+    family.add_person(family_tree.Person("ROOT", "Root"))
+    for side in "AB":
+        parent = "ROOT"
+        for depth in range(8):
+            identifier = f"{side}{depth}"
+            family.add_person(
+                family_tree.Person(identifier, identifier, parents=[parent])
+            )
+            parent = identifier
+    assert family.relationship("A7", "B7") == "Seventh cousin"
+    assert family.relationship("A7", "B5") == "Fifth cousin twice removed"
+    assert family.lowest_common_ancestors("A7", "B5") == {"ROOT"}
+
+
+def test_lowest_common_ancestors(relation_test_fam: family_tree.Family):
+    assert relation_test_fam.lowest_common_ancestors("G1A", "G2C") == {"G3C", "G3D"}
+    assert relation_test_fam.lowest_common_ancestors("G3A", "G3C") == set()
+
+
+def test_components(my_test_fam: family_tree.Family):
+    my_test_fam.add_person(family_tree.Person("AB2000", "Alice Brown"))
+    my_test_fam.add_person(family_tree.Person("C1", "Child One", parents=["Bob Doe"]))
+    assert my_test_fam.components() == [["JD1993", "JJ1996", "C1"], ["AB2000"]]
+
+
+def test_component_of(my_test_fam: family_tree.Family):
+    my_test_fam.add_person(family_tree.Person("AB2000", "Alice Brown"))
+    assert my_test_fam.component_of("JD1993") == my_test_fam.component_of("JJ1996")
+    assert my_test_fam.component_of("AB2000") == "AB2000"
+    assert my_test_fam.component_size("JD1993") == 2
+    with pytest.raises(KeyError):
+        my_test_fam.component_of("Missing")
+
+
+def test_component_summaries(relation_test_fam: family_tree.Family):
+    relation_test_fam.add_person(family_tree.Person("AB2000", "Alice Brown"))
+    summaries = relation_test_fam.component_summaries()
+    assert summaries[0].size == len(relation_test_fam) - 1
+    assert summaries[0].generations == max(
+        len(relation_test_fam.list_ancestors(person)) + 1
+        for person in relation_test_fam.values()
+    )
+    assert summaries[-1] == family_tree.family.ComponentSummary("AB2000", 1, 1)
+
+
+def test_components_split_by_set_parents(my_test_fam: family_tree.Family):
+    child = family_tree.Person("C1", "Child One", parents=["JD1993"])
+    my_test_fam.add_person(child)
+    assert my_test_fam.component_size("C1") == 3
+    my_test_fam.set_parents(child, [])
+    assert my_test_fam.components() == [["JD1993", "JJ1996"], ["C1"]]
+
+
+def test_neighbourhood(relation_test_fam: family_tree.Family):
+    window = relation_test_fam.neighbourhood("G2B", ancestors=1, descendants=1)
+    assert set(window) == {"G2B", "G3C", "G3D", "G1A", "G1B", "G2A"}
+    assert window["G2B"] is relation_test_fam["G2B"]
+    alone = relation_test_fam.neighbourhood("G2B", 0, 0, 0)
+    assert list(alone) == ["G2B"]
+
+
+def test_subfamily(relation_test_fam: family_tree.Family):
+    family = relation_test_fam.subfamily(["G2A", "G2B", "G1A"])
+    assert len(family) == 3
+    assert family["G1A"] is relation_test_fam["G1A"]
+    assert list(family.couples) == [("G2A", "G2B")]
+
+
+def test_import_leaves_slow_modules_unloaded():
+    code = (
+        "import sys, family_tree; "
+        "print(' '.join(sorted(set(sys.argv[1:]) & set(sys.modules))))"
+    )
+    slow = ["sqlite3", "tracemalloc", "concurrent.futures.process"]
+    result = subprocess.run(
+        [sys.executable, "-c", code, *slow], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
+    assert family_tree.SQLiteFamily.__name__ == "SQLiteFamily"
@@ -0,0 +1,83 @@
+from datetime import date
+from pathlib import Path
+
+import pytest  # type: ignore
+
+import family_tree
+from family_tree import gedcom
+from family_tree.dates import PartialDate
+from . import LOCATION
+
+
+@pytest.fixture
+def gedcom_fam() -> family_tree.Family:
+    return family_tree.Family.from_gedcom(f"{LOCATION}test_family.ged")
+
+
+def test_gedcom_people(gedcom_fam: family_tree.Family):
+    assert list(gedcom_fam) == ["JD1993", "I2", "I3"]
+    person = gedcom_fam["JD1993"]
+    assert person.name == "John Doe"
+    assert person.dob == date(1993, 10, 19)
+    assert person.birth_place == "London"
+    assert person.parents == ("I3",)
+    assert person.spouses == ("I2",)
+
+
+def test_gedcom_approximate_dates(gedcom_fam: family_tree.Family):
+    assert gedcom_fam["I2"].dob == PartialDate(1996, 4, circa=True)
+    assert gedcom_fam["I2"].dod == PartialDate(2070, circa=True)
+
+
+def test_gedcom_couples(gedcom_fam: family_tree.Family):
+    assert list(gedcom_fam.couples) == [("I2", "JD1993")]
+    assert gedcom_fam.relationship("JD1993", "I3") == "Parent"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("19 OCT 1993", "1993-10-19"),
+        ("OCT 1993", "1993-10"),
+        ("1993", "1993"),
+        ("EST 1890", "c. 1890"),
+        ("unknown", None),
+        ("19 XYZ 1993", None),
+        ("31 FEB 1990", "1990-02"),
+        ("ABT 0 JUN 1990", "c. 1990-06"),
+    ],
+)
+def test_parse_gedcom_date(value, expected):
+    assert gedcom.parse_gedcom_date(value) == expected
+
+
+def test_gedcom_invalid_day(tmp_path: Path):
+    path = tmp_path / "family.ged"
+    path.write_text(
+        "0 HEAD\n0 @I1@ INDI\n1 NAME Ann /Doe/\n1 BIRT\n2 DATE 31 FEB 1990\n0 TRLR\n"
+    )
+    family = family_tree.Family.from_gedcom(str(path))
+    assert family["I1"].dob == PartialDate(1990, 2)
+
+
+def test_gedcom_round_trip(tmp_path: Path):
+    family = family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+    family["G1A"].dob = "c. 1990-05"
+    family["G2A"].dod = "2001-02-03"
+    path = str(tmp_path / "family.ged")
+    family.to_gedcom(path)
+
+    loaded = family_tree.Family.from_gedcom(path)
+    assert list(loaded) == list(family)
+    assert list(loaded.couples) == list(family.couples)
+    for identifier, person in family.items():
+        assert loaded[identifier].content_hash() == person.content_hash()
+
+
+def test_gedcom_missing_parents_kept(tmp_path: Path):
+    family = family_tree.Family.from_json(f"{LOCATION}test_family.json")
+    path = str(tmp_path / "family.ged")
+    family.to_gedcom(path)
+    loaded = family_tree.Family.from_gedcom(path)
+    assert loaded["JD1993"].parents == ("Bob Doe", "Wendy Smith")
+    assert loaded["Bob Doe"].name == "Bob Doe"
@@ -0,0 +1,54 @@
+from family_tree import constants
+from family_tree.generate import generate_family, generate_people, generate_records
+
+
+def test_size_and_depth():
+    family = generate_family(500, generations=5)
+    assert len(family) == 500
+    deepest = max(len(family.list_ancestors(person)) for person in family.values())
+    assert deepest == 4
+
+
+def test_seeded():
+    first = [(p.name, p.parents, p.spouses) for p in generate_people(200, seed=3)]
+    second = [(p.name, p.parents, p.spouses) for p in generate_people(200, seed=3)]
+    assert first == second
+
+
+def test_records_match_json_format():
+    for record in generate_records(50):
+        assert record.keys() == constants.EXPECTED_KEYS
+
+
+def test_references_exist():
+    family = generate_family(300, remarriage_rate=0.5)
+    for person in family.values():
+        assert all(parent in family.members for parent in person.parents)
+        for spouse in person.spouses:
+            assert person.identifier in family[spouse].spouses
+
+
+def test_remarriage():
+    family = generate_family(300, remarriage_rate=1.0)
+    assert any(len(person.spouses) > 1 for person in family.values())
+
+
+def test_no_sibling_marriages():
+    records = {
+        record["identifier"]: record
+        for record in generate_records(2000, remarriage_rate=0.5, collapse_rate=0.5)
+    }
+    for record in records.values():
+        for spouse in record["spouses"]:
+            assert not set(record["parents"]) & set(records[spouse]["parents"])
+
+
+def test_pedigree_collapse():
+    family = generate_family(300, generations=4, collapse_rate=1.0)
+    cousins = [
+        couple
+        for couple in family.couples.values()
+        if family.relationship(couple.left.identifier, couple.right.identifier)
+        == "First cousin"
+    ]
+    assert cousins
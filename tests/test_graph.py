@@ -0,0 +1,50 @@
+import pytest  # type: ignore
+
+import family_tree
+from . import LOCATION, needs_numpy
+
+pytestmark = needs_numpy
+
+
+@pytest.fixture
+def relation_test_fam() -> family_tree.Family:
+    return family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+
+
+def test_compile_numbers_missing_parents_last():
+    family = family_tree.Family.from_json(f"{LOCATION}test_family.json")
+    compiled = family.compile()
+    assert compiled.identifiers == ["JD1993", "JJ1996", "Bob Doe", "Wendy Smith"]
+    assert compiled.member_count == 2
+
+
+def test_compiled_ancestors(relation_test_fam: family_tree.Family):
+    compiled = relation_test_fam.compile()
+    generations = [
+        set(compiled.to_identifiers(generation))
+        for generation in compiled.ancestors("G1A")
+    ]
+    assert generations == relation_test_fam.list_ancestors(relation_test_fam["G1A"])
+    assert len(compiled.ancestors("G1A", max_generations=1)) == 1
+
+
+def test_compiled_descendants(relation_test_fam: family_tree.Family):
+    compiled = relation_test_fam.compile()
+    generations = [
+        set(compiled.to_identifiers(generation))
+        for generation in compiled.descendants("G4A")
+    ]
+    assert generations == list(
+        relation_test_fam.list_descendants(relation_test_fam["G4A"])
+    )
+
+
+def test_compiled_distances(relation_test_fam: family_tree.Family):
+    compiled = relation_test_fam.compile()
+    relation_test_fam.add_person(family_tree.Person("AB2000", "Alice Brown"))
+    distances = dict(zip(compiled.identifiers, compiled.distances("G4A").tolist()))
+    assert distances["G3D"] == 1
+    assert distances["G3C"] == 2
+    assert distances["G3A"] == 4
+    assert relation_test_fam.compile() is not compiled
+    assert relation_test_fam.compile().distances("G4A", max_depth=1).tolist()[-1] == -1
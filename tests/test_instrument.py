@@ -0,0 +1,57 @@
+import json
+
+import family_tree
+from family_tree import instrument
+from . import LOCATION
+
+
+def test_phases_recorded():
+    with family_tree.Profiler() as profiler:
+        family = family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+        family_tree.FamilyGraph(family, "dot")
+
+    names = [record.name for record in profiler.records]
+    assert names == [
+        "from_json.read",
+        "from_json.validate",
+        "from_json.build",
+        "from_json",
+        "link_family",
+    ]
+    assert profiler.records[2].count == 10
+    assert all(record.seconds >= 0 for record in profiler.records)
+
+
+def test_peak_memory_includes_nested_phases():
+    with family_tree.Profiler() as profiler:
+        with instrument.phase("outer"):
+            with instrument.phase("inner"):
+                data = [0] * 100000
+            del data
+
+    inner, outer = profiler.records
+    assert inner.peak_memory >= 800000
+    assert outer.peak_memory >= inner.peak_memory
+
+
+def test_no_memory_tracing():
+    with family_tree.Profiler(trace_memory=False) as profiler:
+        with instrument.phase("work", 3):
+            pass
+    assert profiler.records[0].peak_memory is None
+
+
+def test_inactive_without_profiler():
+    with instrument.phase("work") as record:
+        assert record is None
+
+
+def test_callback_and_json():
+    finished = []
+    with family_tree.Profiler(callback=finished.append) as profiler:
+        family_tree.Family.from_jsonl(f"{LOCATION}test_family.jsonl")
+
+    assert finished == profiler.records
+    exported = json.loads(profiler.to_json())
+    assert exported[0]["name"] == "from_jsonl"
+    assert exported[0]["count"] == 2
@@ -128,3 +128,26 @@ def test_set_membership_true(
     person_set = {john_doe}
     person_set.add(jane_doe)
     assert (jane_doe in person_set) is True
+
+
+def test_partial_dates_in_html():
+    person = family_tree.Person("JD", "John Doe", "c. 1890", "1950-03")
+    assert person.to_html() == "<b>John Doe</b><br/>b. c. 1890<br/>d. 1950-03"
+
+
+def test_compact_storage(john_doe_data: PersonData):
+    john_doe_data["parents"] = ["BD1960", "WS1962"]
+    john_doe = family_tree.Person(**john_doe_data)
+    assert john_doe.parents == ("BD1960", "WS1962")
+    assert john_doe.spouses == ()
+    assert not hasattr(john_doe, "__dict__")
+
+
+def test_assigned_lists_stored_as_tuples(john_doe_data: PersonData):
+    john_doe = family_tree.Person(**john_doe_data)
+    before = john_doe.content_hash()
+    john_doe.spouses = ["JJ1996"]
+    john_doe.parents = ["BD1960"]
+    assert john_doe.spouses == ("JJ1996",)
+    assert john_doe.parents == ("BD1960",)
+    assert john_doe.content_hash() != before
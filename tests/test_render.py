@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest  # type: ignore
+
+import family_tree
+from family_tree import render
+from . import LOCATION
+
+
+@pytest.fixture
+def pipe_calls(monkeypatch) -> List[str]:  # type: ignore
+    calls: List[str] = []
+
+    def fake_pipe(source: str, layout: str, format: str) -> bytes:
+        calls.append(source)
+        return f"{format}:{len(source)}".encode("utf-8")
+
+    monkeypatch.setattr(render, "_pipe", fake_pipe)
+    return calls
+
+
+@pytest.fixture
+def family_graph() -> family_tree.FamilyGraph:
+    family = family_tree.Family.from_json(f"{LOCATION}test_family.json")
+    return family_tree.FamilyGraph(family, "dot")
+
+
+def test_render_to(family_graph, pipe_calls, tmp_path: Path):
+    path = family_graph.render_to(str(tmp_path / "out.svg"), "svg")
+    assert Path(path).read_bytes().startswith(b"svg:")
+    assert pipe_calls == [family_graph.graph.source]
+
+
+def test_render_to_cached(family_graph, pipe_calls, tmp_path: Path):
+    cache = family_tree.RenderCache(str(tmp_path / "cache"))
+    first = family_graph.render_to(str(tmp_path / "first.svg"), "svg", cache)
+    second = family_graph.render_to(str(tmp_path / "second.svg"), "svg", cache)
+    assert len(pipe_calls) == 1
+    assert Path(first).read_bytes() == Path(second).read_bytes()
+    assert len(cache) == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = family_tree.RenderCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"
+    cache.put("c", b"12345")
+    assert cache.get("b") is None
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+    assert cache.total_bytes == 10
+
+
+def test_cache_reopened(tmp_path: Path):
+    family_tree.RenderCache(str(tmp_path)).put("a", b"data")
+    assert family_tree.RenderCache(str(tmp_path)).get("a") == b"data"
+
+
+def test_render_worker(family_graph, pipe_calls, tmp_path: Path):
+    with family_tree.RenderWorker(max_workers=2, max_pending=1) as worker:
+        futures = [
+            worker.submit(family_graph, str(tmp_path / f"{i}.pdf")) for i in range(3)
+        ]
+    assert [Path(future.result()).name for future in futures] == [
+        "0.pdf",
+        "1.pdf",
+        "2.pdf",
+    ]
+    assert len(pipe_calls) == 3
@@ -0,0 +1,79 @@
+import pytest  # type: ignore
+
+import family_tree
+from . import LOCATION
+
+
+@pytest.fixture
+def snapshot_path(tmp_path) -> str:  # type: ignore
+    family = family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+    family.add_person(
+        family_tree.Person(
+            "X1890", "Xavier Smith", "c. 1890", "1950-01-01", ["G9"], ["Y1890"], "Paris"
+        )
+    )
+    path = str(tmp_path / "family.snapshot")
+    family.save_snapshot(path)
+    return path
+
+
+@pytest.fixture
+def loaded_fam(snapshot_path: str) -> family_tree.Family:
+    return family_tree.Family.load_snapshot(snapshot_path)
+
+
+def test_snapshot_members(loaded_fam: family_tree.Family):
+    assert len(loaded_fam) == 11
+    assert list(loaded_fam)[:2] == ["G1A", "G1B"]
+
+
+def test_snapshot_person(loaded_fam: family_tree.Family):
+    person = loaded_fam["X1890"]
+    assert person.name == "Xavier Smith"
+    assert str(person.dob) == "c. 1890"
+    assert person.parents == ("G9",)
+    assert person.spouses == ("Y1890",)
+    assert person.birth_place == "Paris"
+
+
+def test_snapshot_same_person_returned(loaded_fam: family_tree.Family):
+    assert loaded_fam["G1A"] is loaded_fam["G1A"]
+
+
+def test_snapshot_missing_person(loaded_fam: family_tree.Family):
+    assert "Y1890" not in loaded_fam
+    with pytest.raises(KeyError):  # type: ignore
+        loaded_fam["Y1890"]
+
+
+def test_snapshot_couples(loaded_fam: family_tree.Family):
+    assert set(loaded_fam.couples) == {("G2A", "G2B"), ("G3A", "G3B"), ("G3C", "G3D")}
+
+
+def test_snapshot_couples_of(loaded_fam: family_tree.Family):
+    couples = loaded_fam.couples_of(loaded_fam["G3C"])
+    assert couples == [family_tree.Couple(loaded_fam["G3C"], loaded_fam["G3D"])]
+    assert couples[0] is loaded_fam.couples[("G3C", "G3D")]
+
+
+def test_snapshot_relationship(loaded_fam: family_tree.Family):
+    assert loaded_fam.relationship("G1A", "G4A") == "Great Grand-Parent"
+
+
+def test_snapshot_add_person(loaded_fam: family_tree.Family):
+    loaded_fam.add_person(family_tree.Person("Y1890", "Yvonne Smith"))
+    assert len(loaded_fam) == 12
+    assert ("X1890", "Y1890") in loaded_fam.couples
+    assert len(loaded_fam.couples_of(loaded_fam["X1890"])) == 1
+
+
+def test_snapshot_components(loaded_fam: family_tree.Family):
+    assert loaded_fam.components()[-1] == ["X1890"]
+    loaded_fam.add_person(family_tree.Person("AB2000", "Alice Brown", parents=["G9"]))
+    assert loaded_fam.component_size("X1890") == 2
+    assert loaded_fam.component_size("G1A") == len(loaded_fam) - 2
+
+
+def test_not_a_snapshot():
+    with pytest.raises(ValueError):  # type: ignore
+        family_tree.Family.load_snapshot(f"{LOCATION}test_family.json")
@@ -0,0 +1,89 @@
+import itertools
+from pathlib import Path
+
+import pytest  # type: ignore
+
+import family_tree
+from . import LOCATION
+
+
+@pytest.fixture
+def relation_test_fam() -> family_tree.Family:
+    return family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+
+
+@pytest.fixture
+def stored_fam(tmp_path: Path) -> family_tree.SQLiteFamily:
+    return family_tree.SQLiteFamily.from_json(
+        f"{LOCATION}relationship_test.json", str(tmp_path / "family.db")
+    )
+
+
+def test_store_members(stored_fam, relation_test_fam):
+    assert len(stored_fam) == len(relation_test_fam)
+    assert list(stored_fam) == list(relation_test_fam)
+    assert "G1A" in stored_fam
+    assert "Missing" not in stored_fam
+    with pytest.raises(KeyError):
+        stored_fam["Missing"]
+
+
+def test_store_person(stored_fam, relation_test_fam):
+    person = stored_fam["G2A"]
+    expected = relation_test_fam["G2A"]
+    assert person.content_hash() == expected.content_hash()
+
+
+def test_store_couples(stored_fam, relation_test_fam):
+    assert list(stored_fam.couples) == list(relation_test_fam.couples)
+    assert (
+        stored_fam.couples[("G2A", "G2B")] == relation_test_fam.couples[("G2A", "G2B")]
+    )
+
+
+def test_store_couples_of(stored_fam, relation_test_fam):
+    for identifier in relation_test_fam:
+        assert stored_fam.couples_of(stored_fam[identifier]) == (
+            relation_test_fam.couples_of(relation_test_fam[identifier])
+        )
+
+
+def test_store_ancestors(stored_fam, relation_test_fam):
+    for identifier in relation_test_fam:
+        assert stored_fam.list_ancestors(
+            stored_fam[identifier]
+        ) == relation_test_fam.list_ancestors(relation_test_fam[identifier])
+
+
+def test_store_relationships(stored_fam, relation_test_fam):
+    for first, second in itertools.permutations(relation_test_fam, 2):
+        assert stored_fam.relationship(first, second) == (
+            relation_test_fam.relationship(first, second)
+        )
+
+
+def test_store_reopened(stored_fam, tmp_path: Path):
+    stored_fam.add_person(family_tree.Person("X", "New Person", parents=["G1A"]))
+    stored_fam.close()
+    with family_tree.SQLiteFamily(str(tmp_path / "family.db")) as reopened:
+        assert len(reopened) == 11
+        assert reopened.relationship("X", "G2A") == "Grand-Parent"
+        assert [child.identifier for child in reopened.children(reopened["G1A"])] == [
+            "X"
+        ]
+
+
+def test_store_from_jsonl(tmp_path: Path):
+    family = family_tree.SQLiteFamily.from_jsonl(
+        f"{LOCATION}test_family.jsonl", str(tmp_path / "family.db")
+    )
+    assert list(family.couples) == [("JD1993", "JJ1996")]
+    assert family.list_ancestors(family["JD1993"]) == [{"Bob Doe", "Wendy Smith"}]
+
+
+def test_store_from_gedcom(tmp_path: Path):
+    family = family_tree.SQLiteFamily.from_gedcom(
+        f"{LOCATION}test_family.ged", str(tmp_path / "family.db")
+    )
+    assert list(family) == ["JD1993", "I2", "I3"]
+    assert family.relationship("JD1993", "I3") == "Parent"
@@ -0,0 +1,116 @@
+import io
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest  # type: ignore
+
+import family_tree
+from . import LOCATION
+
+needs_graphviz = pytest.mark.skipif(  # type: ignore
+    shutil.which("dot") is None, reason="graphviz is not installed"
+)
+
+
+@pytest.fixture
+def two_lineage_fam() -> family_tree.Family:
+    family = family_tree.Family.from_json(f"{LOCATION}relationship_test.json")
+    family.add_people(
+        family_tree.Family.from_json(f"{LOCATION}test_family.json").values()
+    )
+    return family
+
+
+def test_graph_source(two_lineage_fam: family_tree.Family):
+    source = family_tree.FamilyGraph(two_lineage_fam, "dot").graph.source
+    assert "G2A -- G2B [color=red]" in source
+    assert "G3CG3D -- G2C" in source
+
+
+def test_component_graphs(two_lineage_fam: family_tree.Family):
+    graphs = family_tree.FamilyGraph(two_lineage_fam, "dot").component_graphs()
+    assert [len(graph.family) for graph in graphs] == [10, 2]
+    assert [graph.graph.name for graph in graphs] == ["My Family 1", "My Family 2"]
+
+
+def test_focused_graph(two_lineage_fam: family_tree.Family):
+    graph = family_tree.FamilyGraph.focused(two_lineage_fam, "G2B", "dot", 1, 1, 0)
+    assert graph.focus == "G2B"
+    assert set(graph.family) == {"G2B", "G3C", "G3D", "G1A", "G1B"}
+    # G3D's parent is outside the window, so is not linked
+    assert "G4A" not in graph.graph.source
+
+
+@needs_graphviz
+def test_render_components(two_lineage_fam: family_tree.Family, tmp_path: Path):
+    graph = family_tree.FamilyGraph(two_lineage_fam, "dot")
+    paths = graph.render_components(str(tmp_path), "svg", max_workers=2)
+    assert len(paths) == 2
+
+
+@pytest.fixture
+def html_calls(monkeypatch) -> List[str]:  # type: ignore
+    calls: List[str] = []
+    to_html = family_tree.Person.to_html
+
+    def counting_to_html(person: family_tree.Person) -> str:
+        calls.append(person.identifier)
+        return to_html(person)
+
+    monkeypatch.setattr(family_tree.Person, "to_html", counting_to_html)
+    return calls
+
+
+def test_labels_rendered_once(two_lineage_fam: family_tree.Family, html_calls):
+    family_tree.FamilyGraph(two_lineage_fam, "dot")
+    assert sorted(html_calls) == sorted(two_lineage_fam.keys())
+
+
+def test_refresh_unchanged(two_lineage_fam: family_tree.Family, html_calls):
+    family_graph = family_tree.FamilyGraph(two_lineage_fam, "dot")
+    source = family_graph.graph.source
+    html_calls.clear()
+    family_graph.refresh()
+    assert html_calls == []
+    assert family_graph.graph.source == source
+
+
+def test_refresh_changed(two_lineage_fam: family_tree.Family, html_calls):
+    family_graph = family_tree.FamilyGraph(two_lineage_fam, "dot")
+    html_calls.clear()
+    two_lineage_fam["G2A"].name = "Renamed Person"
+    two_lineage_fam.add_person(family_tree.Person("NEW", "New Person"))
+    family_graph.refresh()
+    assert sorted(html_calls) == ["G2A", "NEW"]
+    assert "Renamed Person" in family_graph.graph.source
+    assert family_graph.graph.source.count("Renamed Person") == 2
+
+
+def test_unchanged_render_skipped(two_lineage_fam: family_tree.Family, tmp_path: Path):
+    family_graph = family_tree.FamilyGraph(two_lineage_fam, "dot")
+    family_graph.graph.directory = str(tmp_path)
+    output = f"{family_graph.graph.filepath}.pdf"
+    family_graph.graph.save()
+    assert not family_graph._is_rendered(output)
+    open(output, "w").close()
+    assert family_graph._is_rendered(output)
+    two_lineage_fam["G2A"].name = "Renamed Person"
+    family_graph.refresh()
+    assert not family_graph._is_rendered(output)
+
+
+def test_streamed_source_matches(two_lineage_fam: family_tree.Family):
+    linked = family_tree.FamilyGraph(two_lineage_fam, "dot")
+    streamed = family_tree.FamilyGraph(two_lineage_fam, "dot", link=False)
+    out = io.StringIO()
+    streamed.write_source(out)
+    assert out.getvalue() == linked.graph.source
+    assert streamed.graph.body == []
+
+
+@needs_graphviz
+def test_render_stream(two_lineage_fam: family_tree.Family, tmp_path: Path):
+    family_graph = family_tree.FamilyGraph(two_lineage_fam, "dot", link=False)
+    output = family_graph.render_stream(str(tmp_path / "family.svg"), "svg")
+    assert Path(output).exists()